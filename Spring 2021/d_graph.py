@@ -4,8 +4,55 @@
 # Description: Implement a directed graph class
 
 import heapq
+import mmap
+import struct
+from array import array
 from collections import deque
 
+# binary edge list files are a flat sequence of (source, destination, weight) records
+EDGE_RECORD = struct.Struct('<iid')
+# snapshot header: magic, weight typecode ('i' or 'd'), vertex count, edge count
+SNAPSHOT_HEADER = struct.Struct('<4sc3xii')
+SNAPSHOT_MAGIC = b'DGS1'
+
+
+class OutEdges(dict):
+    """
+    A vertex's outgoing edges, as a dict of destination vertex to weight. Also caches a sorted list of the
+    destinations for ordered traversals: in_order() builds it when it is needed and adding or removing an edge drops
+    it, so edge updates stay O(1) on average.
+    """
+
+    __slots__ = ('_in_order',)
+
+    def __init__(self):
+        super().__init__()
+        self._in_order = None
+
+    def __setitem__(self, dst: int, weight) -> None:
+        """
+        Adds or reweights the edge to dst
+        """
+        if dst not in self:
+            self._in_order = None
+        super().__setitem__(dst, weight)
+
+    def pop(self, dst: int, *default):
+        """
+        Removes the edge to dst and returns its weight (see dict.pop)
+        """
+        self._in_order = None
+        return super().pop(dst, *default)
+
+    def in_order(self) -> []:
+        """
+        Returns the destinations as a sorted list, sorting them only if they changed since the last call. The list
+        belongs to the OutEdges and must not be modified.
+        """
+        if self._in_order is None:
+            self._in_order = sorted(self)
+        return self._in_order
+
 
 class DirectedGraph:
     """
@@ -18,11 +65,16 @@ class DirectedGraph:
 
     def __init__(self, start_edges=None):
         """
-        Store graph info as adjacency matrix
-        DO NOT CHANGE THIS METHOD IN ANY WAY
+        Store graph info as adjacency matrix, plus a sparse edge index that add_vertex(), add_edge() and remove_edge()
+        keep in sync with it: each vertex's outgoing edges (an OutEdges of {destination: weight}), each vertex's
+        in-degree and the total edge count. This extends the skeleton's frozen constructor, as the index has to exist
+        before the start edges are added.
         """
         self.v_count = 0
         self.adj_matrix = []
+        self._out_edges = []
+        self._in_degree = []
+        self._edge_count = 0
 
         # populate graph with initial vertices and edges (if provided)
         # before using, implement add_vertex() and add_edge() methods
@@ -54,6 +106,19 @@ class DirectedGraph:
 
     # ------------------------------------------------------------------ #
 
+    @classmethod
+    def _with_vertices(cls, v_count: int) -> 'DirectedGraph':
+        """
+        Returns a graph with v_count vertices and no edges, allocating the whole matrix at once instead of growing it
+        one vertex at a time
+        """
+        graph = cls()
+        graph.v_count = v_count
+        graph.adj_matrix = [[0] * v_count for _ in range(v_count)]
+        graph._out_edges = [OutEdges() for _ in range(v_count)]
+        graph._in_degree = [0] * v_count
+        return graph
+
     def add_vertex(self) -> int:
         """
         Adds vertex to graph and returns the number of vertices in graph after addition
@@ -64,6 +129,8 @@ class DirectedGraph:
         self.adj_matrix.append(new_vertex_list)
         for v in self.adj_matrix:
             v.append(0)
+        self._out_edges.append(OutEdges())
+        self._in_degree.append(0)
         self.v_count += 1
         return self.v_count
 
@@ -72,14 +139,21 @@ class DirectedGraph:
         Adds an edge between the provided vertex indices
         """
         if 0 <= src < self.v_count and 0 <= dst < self.v_count and weight > 0 and src != dst:
+            if self.adj_matrix[src][dst] == 0:
+                self._in_degree[dst] += 1
+                self._edge_count += 1
             self.adj_matrix[src][dst] = weight
+            self._out_edges[src][dst] = weight
 
     def remove_edge(self, src: int, dst: int) -> None:
         """
         Removes edge between the provided vertex indices
         """
-        if 0 <= src < self.v_count and 0 <= dst < self.v_count:
+        if 0 <= src < self.v_count and 0 <= dst < self.v_count and self.adj_matrix[src][dst] != 0:
             self.adj_matrix[src][dst] = 0
+            self._out_edges[src].pop(dst)
+            self._in_degree[dst] -= 1
+            self._edge_count -= 1
 
     def get_vertices(self) -> []:
         """
@@ -91,12 +165,57 @@ class DirectedGraph:
         """
         Returns list of graph's edges in the form of tuples: (source vertex, destination vertex, weight)
         """
-        edge_list = []
+        return list(self.iter_edges())
+
+    def iter_edges(self):
+        """
+        Generator that yields the graph's edges as (source vertex, destination vertex, weight) tuples, in the same order
+        as get_edges(). Only visits existing edges, so it is O(V + E log E) rather than a scan of the whole matrix.
+        """
+        for i in range(self.v_count):
+            for j, weight in sorted(self._out_edges[i].items()):
+                yield i, j, weight
+
+    def edge_count(self) -> int:
+        """
+        Returns the number of edges in the graph
+        """
+        return self._edge_count
+
+    def out_degree(self, v: int) -> int:
+        """
+        Returns the number of edges leaving the provided vertex
+        """
+        return len(self._out_edges[v])
+
+    def in_degree(self, v: int) -> int:
+        """
+        Returns the number of edges entering the provided vertex
+        """
+        return self._in_degree[v]
+
+    def edge_arrays(self):
+        """
+        Returns all of the graph's edges at once as three NumPy arrays (sources, destinations, weights), in the same
+        order as get_edges(). The arrays are filled from the sparse edge index, so this is O(V+E) time and memory and
+        never touches the adjacency matrix.
+        """
+        # numpy is only needed for this export, so it isn't imported with the module
+        import numpy
+
+        sources = array('q')
+        destinations = array('q')
+        weights = []
         for i in range(self.v_count):
-            for j in range(self.v_count):
-                if self.adj_matrix[i][j] > 0:
-                    edge_list.append((i,j,self.adj_matrix[i][j]))
-        return edge_list
+            out_edges = self._out_edges[i]
+            in_order = out_edges.in_order()
+            sources.extend([i] * len(in_order))
+            destinations.extend(in_order)
+            weights.extend([out_edges[j] for j in in_order])
+        # copied out of the array buffers, so the results are ordinary writable arrays
+        sources = numpy.frombuffer(sources, dtype=numpy.int64).copy()
+        destinations = numpy.frombuffer(destinations, dtype=numpy.int64).copy()
+        return sources, destinations, numpy.array(weights) if len(weights) > 0 else numpy.zeros(0, dtype=numpy.int64)
 
     def is_valid_path(self, path: []) -> bool:
         """
@@ -118,20 +237,10 @@ class DirectedGraph:
         search, in the order they were visited. When ambiguous, vertices are picked in ascending order.
         """
         visited = []
-        if v_start >= self.v_count or v_start < 0:
-            return visited
-        dfs_deque = deque()
-        dfs_deque.append(v_start)
-        while len(dfs_deque) > 0:
-            curr_v = dfs_deque.pop()
-            if curr_v not in visited:
-                visited.append(curr_v)
-                if curr_v == v_end:
-                    return visited
-            for j in range(self.v_count-1,-1,-1):
-                if self.adj_matrix[curr_v][j] > 0:
-                    if j not in visited:
-                        dfs_deque.append(j)
+        for curr_v in self.iter_dfs(v_start):
+            visited.append(curr_v)
+            if curr_v == v_end:
+                break
         return visited
 
     def bfs(self, v_start, v_end=None) -> []:
@@ -140,21 +249,57 @@ class DirectedGraph:
         search, in the order they were visited. When ambiguous, vertices are picked in ascending order.
         """
         visited = []
+        for curr_v in self.iter_bfs(v_start):
+            visited.append(curr_v)
+            if curr_v == v_end:
+                break
+        return visited
+
+    def iter_dfs(self, v_start, detail=False):
+        """
+        Generator version of dfs(): lazily yields vertices in the same order, so the caller can stop at any point
+        without paying for the rest of the search. With detail=True, yields (vertex, depth, parent) tuples instead,
+        where parent is None for v_start.
+        Each stack frame is a vertex, its depth and an iterator over its cached OutEdges.in_order() list, so the search
+        itself needs O(1) memory per frame on top of the visited flags; the sorted neighbor lists are kept by the graph
+        and reused by later traversals. The graph must not be modified while the generator is in use.
+        """
         if v_start >= self.v_count or v_start < 0:
-            return visited
+            return
+        visited = [False] * self.v_count
+        visited[v_start] = True
+        yield (v_start, 0, None) if detail else v_start
+        dfs_stack = [(v_start, 0, iter(self._out_edges[v_start].in_order()))]
+        while len(dfs_stack) > 0:
+            curr_v, depth, neighbors = dfs_stack[-1]
+            for j in neighbors:
+                if not visited[j]:
+                    visited[j] = True
+                    yield (j, depth + 1, curr_v) if detail else j
+                    dfs_stack.append((j, depth + 1, iter(self._out_edges[j].in_order())))
+                    break
+            else:
+                dfs_stack.pop()
+
+    def iter_bfs(self, v_start, detail=False):
+        """
+        Generator version of bfs(): lazily yields vertices in the same order, so the caller can stop at any point
+        without paying for the rest of the search. With detail=True, yields (vertex, depth, parent) tuples instead,
+        where parent is None for v_start.
+        """
+        if v_start >= self.v_count or v_start < 0:
+            return
+        visited = [False] * self.v_count
+        visited[v_start] = True
         bfs_deque = deque()
-        bfs_deque.append(v_start)
+        bfs_deque.append((v_start, 0, None))
         while len(bfs_deque) > 0:
-            curr_v = bfs_deque.popleft()
-            if curr_v not in visited:
-                visited.append(curr_v)
-                if curr_v == v_end:
-                    return visited
-            for j in range(self.v_count):
-                if self.adj_matrix[curr_v][j] > 0:
-                    if j not in visited:
-                        bfs_deque.append(j)
-        return visited
+            curr_v, depth, parent = bfs_deque.popleft()
+            yield (curr_v, depth, parent) if detail else curr_v
+            for j in self._out_edges[curr_v].in_order():
+                if not visited[j]:
+                    visited[j] = True
+                    bfs_deque.append((j, depth + 1, curr_v))
 
     def has_cycle(self):
         """
@@ -220,6 +365,455 @@ class DirectedGraph:
                 return_list.append(float('inf'))
         return return_list
 
+    def strongly_connected_components(self) -> []:
+        """
+        Returns list of the graph's strongly connected components, each one a sorted list of vertices. Components are
+        listed in topological order of the condensation (edges between components only go from a component to one
+        listed after it). Uses Tarjan's algorithm with an explicit stack instead of recursion, so it runs in O(V+E)
+        and is not limited by Python's recursion limit.
+        """
+        index = [-1] * self.v_count
+        low = [0] * self.v_count
+        on_stack = [False] * self.v_count
+        scc_stack = []
+        components = []
+        counter = 0
+        for root in range(self.v_count):
+            if index[root] != -1:
+                continue
+            index[root] = low[root] = counter
+            counter += 1
+            scc_stack.append(root)
+            on_stack[root] = True
+            # each work entry is a vertex and an iterator over the outgoing edges it still has to explore
+            work = [(root, iter(self._out_edges[root]))]
+            while len(work) > 0:
+                curr_v, neighbors = work[-1]
+                for j in neighbors:
+                    if index[j] == -1:
+                        index[j] = low[j] = counter
+                        counter += 1
+                        scc_stack.append(j)
+                        on_stack[j] = True
+                        work.append((j, iter(self._out_edges[j])))
+                        break
+                    if on_stack[j] and index[j] < low[curr_v]:
+                        low[curr_v] = index[j]
+                else:
+                    # every edge of curr_v explored, pass its low-link back up to the vertex that discovered it
+                    work.pop()
+                    if len(work) > 0 and low[curr_v] < low[work[-1][0]]:
+                        low[work[-1][0]] = low[curr_v]
+                    if low[curr_v] == index[curr_v]:
+                        component = []
+                        while True:
+                            j = scc_stack.pop()
+                            on_stack[j] = False
+                            component.append(j)
+                            if j == curr_v:
+                                break
+                        component.sort()
+                        components.append(component)
+        # Tarjan finds components in reverse topological order
+        components.reverse()
+        return components
+
+    def condensation(self) -> 'DirectedGraph':
+        """
+        Returns a new DirectedGraph (always acyclic) with one vertex per strongly connected component. Vertex i of the
+        new graph is component i of strongly_connected_components(). Parallel edges between two components are merged
+        into a single edge carrying the smallest of their weights. Apart from allocating the new graph's matrix at once,
+        which is C^2 for C components, it runs in O(V+E).
+        """
+        components = self.strongly_connected_components()
+        component_of = [0] * self.v_count
+        for i, component in enumerate(components):
+            for v in component:
+                component_of[v] = i
+        condensed = DirectedGraph._with_vertices(len(components))
+        for i in range(self.v_count):
+            src = component_of[i]
+            for j, weight in self._out_edges[i].items():
+                dst = component_of[j]
+                if src != dst:
+                    curr_weight = condensed.adj_matrix[src][dst]
+                    if curr_weight == 0 or weight < curr_weight:
+                        condensed.add_edge(src, dst, weight)
+        return condensed
+
+    def max_flow(self, src: int, sink: int):
+        """
+        Returns the value of the maximum flow from src to sink, treating edge weights as capacities. Runs Dinic's
+        algorithm on a FlowNetwork built from the graph's sparse edge index.
+        """
+        network = self._flow_network()
+        return network.max_flow(src, sink)
+
+    def min_cut(self, src: int, sink: int) -> ():
+        """
+        Returns a minimum src-sink cut as a tuple (cut capacity, sorted list of vertices on the source side, list of
+        cut edges as (source vertex, destination vertex, weight) tuples). The cut capacity equals the maximum flow.
+        """
+        network = self._flow_network()
+        flow = network.max_flow(src, sink)
+        source_side = network.source_side(src)
+        on_source_side = [False] * self.v_count
+        for v in source_side:
+            on_source_side[v] = True
+        cut_edges = [(i, j, weight) for i in source_side for j, weight in sorted(self._out_edges[i].items())
+                     if not on_source_side[j]]
+        return flow, source_side, cut_edges
+
+    def _flow_network(self) -> 'FlowNetwork':
+        """
+        Returns a FlowNetwork with one edge per graph edge, using edge weights as capacities
+        """
+        network = FlowNetwork(self.v_count)
+        for i in range(self.v_count):
+            for j, weight in self._out_edges[i].items():
+                network.add_edge(i, j, weight)
+        return network
+
+    def min_arborescence(self, root: int) -> []:
+        """
+        Returns the minimum weight spanning arborescence rooted at root (a tree of edges reaching every vertex from root)
+        as a sorted list of (source vertex, destination vertex, weight) tuples. Vertices that can't be reached from root
+        are left out. Uses Edmonds' algorithm, see minimum_arborescence().
+        """
+        if root >= self.v_count or root < 0:
+            return []
+        reachable = list(self.iter_bfs(root))
+        index = {v: i for i, v in enumerate(reachable)}
+        edges = [(index[i], index[j], weight) for i in reachable for j, weight in self._out_edges[i].items()]
+        return sorted((reachable[u], reachable[v], weight)
+                      for u, v, weight in minimum_arborescence(len(reachable), 0, edges))
+
+    @staticmethod
+    def iter_edge_file(path: str, delimiter=None, binary=False):
+        """
+        Generator that streams (source vertex, destination vertex, weight) tuples from an edge list file without
+        loading it into memory. Text files hold one edge per line, separated by the delimiter (commas or any
+        whitespace when not given, so CSV and TSV both work); the weight column is optional and defaults to 1. Blank
+        lines and lines starting with '#' are skipped. Binary files are a sequence of EDGE_RECORD records.
+        """
+        if binary:
+            with open(path, 'rb') as edge_file:
+                while True:
+                    chunk = edge_file.read(EDGE_RECORD.size * 65536)
+                    if len(chunk) == 0:
+                        return
+                    if len(chunk) % EDGE_RECORD.size != 0:
+                        raise ValueError(f'{path} is not a whole number of edge records')
+                    yield from EDGE_RECORD.iter_unpack(chunk)
+        with open(path) as edge_file:
+            for line in edge_file:
+                line = line.strip()
+                if len(line) == 0 or line[0] == '#':
+                    continue
+                if delimiter is None and ',' in line:
+                    fields = line.split(',')
+                else:
+                    fields = line.split(delimiter)
+                weight = 1
+                if len(fields) > 2:
+                    weight = fields[2].strip()
+                    weight = int(weight) if weight.lstrip('-').isdigit() else float(weight)
+                yield int(fields[0]), int(fields[1]), weight
+
+    @classmethod
+    def from_edge_file(cls, path: str, delimiter=None, binary=False) -> 'DirectedGraph':
+        """
+        Builds a graph from an edge list file (see iter_edge_file) in two streaming passes: the first finds the number
+        of vertices so the matrix can be allocated once, the second fills in the edges
+        """
+        v_count = -1
+        for u, v, _ in cls.iter_edge_file(path, delimiter, binary):
+            v_count = max(v_count, u, v)
+        graph = cls._with_vertices(v_count + 1)
+        for u, v, weight in cls.iter_edge_file(path, delimiter, binary):
+            graph.add_edge(u, v, weight)
+        return graph
+
+    def save_snapshot(self, path: str) -> None:
+        """
+        Writes the graph to a compact binary snapshot: SNAPSHOT_HEADER followed by packed arrays of per-vertex edge
+        offsets (int32, v_count + 1 of them), edge destinations (int32) and edge weights (int32 when every weight is a
+        32-bit integer, float64 otherwise, padded to start on an 8 byte boundary)
+        """
+        offsets = array('i', [0])
+        destinations = array('i')
+        weights = []
+        for i in range(self.v_count):
+            for j, weight in self._out_edges[i].items():
+                destinations.append(j)
+                weights.append(weight)
+            offsets.append(len(destinations))
+        if all(type(w) is int and w < 2 ** 31 for w in weights):
+            weights = array('i', weights)
+        else:
+            weights = array('d', weights)
+        with open(path, 'wb') as snapshot:
+            snapshot.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, weights.typecode.encode(), self.v_count,
+                                                len(destinations)))
+            snapshot.write(offsets.tobytes())
+            snapshot.write(destinations.tobytes())
+            snapshot.write(b'\0' * (-snapshot.tell() % 8))
+            snapshot.write(weights.tobytes())
+
+    @classmethod
+    def load_snapshot(cls, path: str) -> 'DirectedGraph':
+        """
+        Loads a graph written by save_snapshot(). The file is memory-mapped and its arrays are read in place through
+        typed memoryviews, so nothing is parsed.
+        """
+        with open(path, 'rb') as snapshot, mmap.mmap(snapshot.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            magic, typecode, v_count, e_count = SNAPSHOT_HEADER.unpack_from(buffer)
+            if magic != SNAPSHOT_MAGIC:
+                raise ValueError(f'{path} is not a DirectedGraph snapshot')
+            start = SNAPSHOT_HEADER.size
+            end = start + 4 * (v_count + 1)
+            weights_start = end + 4 * e_count
+            weights_start += -weights_start % 8
+            typecode = typecode.decode()
+            with memoryview(buffer) as view:
+                offsets = view[start:end].cast('i')
+                destinations = view[end:end + 4 * e_count].cast('i')
+                weights = view[weights_start:weights_start + array(typecode).itemsize * e_count].cast(typecode)
+                graph = cls._with_vertices(v_count)
+                in_degree = graph._in_degree
+                for i in range(v_count):
+                    row = graph.adj_matrix[i]
+                    out_edges = graph._out_edges[i]
+                    for k in range(offsets[i], offsets[i + 1]):
+                        row[destinations[k]] = out_edges[destinations[k]] = weights[k]
+                        in_degree[destinations[k]] += 1
+                graph._edge_count = e_count
+                offsets.release()
+                destinations.release()
+                weights.release()
+        return graph
+
+
+class FlowNetwork:
+    """
+    Residual network for maximum flow / minimum cut computations
+    - edges are stored in flat arrays, each one paired with its reverse edge at index ^ 1
+    - capacities are updated in place as flow is pushed
+    - vertex names are integers from 0 to v_count - 1
+    """
+
+    def __init__(self, v_count: int):
+        """
+        Creates a network with v_count vertices and no edges
+        """
+        self.v_count = v_count
+        self._edges_from = [[] for _ in range(v_count)]
+        self._head = []
+        self._capacity = []
+
+    def add_edge(self, src: int, dst: int, capacity) -> None:
+        """
+        Adds an edge with the provided capacity between the provided vertex indices, along with its reverse residual
+        edge
+        """
+        self._edges_from[src].append(len(self._head))
+        self._head.append(dst)
+        self._capacity.append(capacity)
+        self._edges_from[dst].append(len(self._head))
+        self._head.append(src)
+        self._capacity.append(0)
+
+    def _levels(self, src: int, sink: int) -> []:
+        """
+        Breadth-first search over edges with remaining capacity. Returns each vertex's distance from src (-1 when
+        unreachable), or None if sink can't be reached.
+        """
+        level = [-1] * self.v_count
+        level[src] = 0
+        bfs_deque = deque([src])
+        while len(bfs_deque) > 0:
+            curr_v = bfs_deque.popleft()
+            for e in self._edges_from[curr_v]:
+                if self._capacity[e] > 0 and level[self._head[e]] == -1:
+                    level[self._head[e]] = level[curr_v] + 1
+                    bfs_deque.append(self._head[e])
+        return level if level[sink] != -1 else None
+
+    def max_flow(self, src: int, sink: int):
+        """
+        Pushes the maximum possible flow from src to sink using Dinic's algorithm and returns its value. Blocking flows
+        are found with an explicit path stack rather than recursion.
+        """
+        total = 0
+        if src == sink:
+            return total
+        head = self._head
+        capacity = self._capacity
+        while True:
+            level = self._levels(src, sink)
+            if level is None:
+                return total
+            next_edge = [0] * self.v_count
+            path = []
+            curr_v = src
+            while True:
+                if curr_v == sink:
+                    flow = min(capacity[e] for e in path)
+                    for e in path:
+                        capacity[e] -= flow
+                        capacity[e ^ 1] += flow
+                    total += flow
+                    # retreat to the tail of the first edge this augmentation saturated
+                    saturated = 0
+                    while capacity[path[saturated]] > 0:
+                        saturated += 1
+                    del path[saturated:]
+                    curr_v = head[path[-1]] if len(path) > 0 else src
+                    continue
+                edges = self._edges_from[curr_v]
+                while next_edge[curr_v] < len(edges):
+                    e = edges[next_edge[curr_v]]
+                    if capacity[e] > 0 and level[head[e]] == level[curr_v] + 1:
+                        break
+                    next_edge[curr_v] += 1
+                if next_edge[curr_v] < len(edges):
+                    path.append(edges[next_edge[curr_v]])
+                    curr_v = head[path[-1]]
+                else:
+                    # dead end, no augmenting path continues through curr_v in this phase
+                    level[curr_v] = -1
+                    if len(path) == 0:
+                        break
+                    curr_v = head[path.pop() ^ 1]
+                    next_edge[curr_v] += 1
+
+    def source_side(self, src: int) -> []:
+        """
+        Returns sorted list of vertices still reachable from src through edges with remaining capacity. After
+        max_flow() this is the source side of a minimum cut.
+        """
+        visited = [False] * self.v_count
+        visited[src] = True
+        bfs_deque = deque([src])
+        while len(bfs_deque) > 0:
+            curr_v = bfs_deque.popleft()
+            for e in self._edges_from[curr_v]:
+                if self._capacity[e] > 0 and not visited[self._head[e]]:
+                    visited[self._head[e]] = True
+                    bfs_deque.append(self._head[e])
+        return [v for v in range(self.v_count) if visited[v]]
+
+
+def minimum_arborescence(v_count: int, root: int, edges: []) -> []:
+    """
+    Edmonds' algorithm in Tarjan's O(E log V) form. Takes a vertex count, a root vertex and a list of (source vertex,
+    destination vertex, weight) edges, and returns the list of edges forming the minimum weight spanning arborescence
+    rooted at root, or None if some vertex can't be reached from root. Each vertex keeps its incoming edges in a
+    leftist heap; cycles of cheapest incoming edges are contracted with a union-find that can be rolled back, which is
+    how the cycles are expanded again at the end.
+    """
+    key = [weight for _, _, weight in edges]
+    left = [-1] * len(edges)
+    right = [-1] * len(edges)
+    rank = [1] * len(edges)
+    delta = [0] * len(edges)
+
+    def push(a):
+        # apply a pending weight adjustment to a heap node and hand it down to its children
+        if delta[a] != 0:
+            key[a] += delta[a]
+            if left[a] != -1:
+                delta[left[a]] += delta[a]
+            if right[a] != -1:
+                delta[right[a]] += delta[a]
+            delta[a] = 0
+
+    def merge(a, b):
+        # recursion only follows right spines, which are O(log E) long in a leftist heap
+        if a == -1 or b == -1:
+            return a if b == -1 else b
+        push(a)
+        push(b)
+        if key[b] < key[a]:
+            a, b = b, a
+        right[a] = merge(right[a], b)
+        if left[a] == -1 or rank[left[a]] < rank[right[a]]:
+            left[a], right[a] = right[a], left[a]
+        rank[a] = 1 if right[a] == -1 else rank[right[a]] + 1
+        return a
+
+    parent = list(range(v_count))
+    size = [1] * v_count
+    history = []
+
+    def find(v):
+        while parent[v] != v:
+            v = parent[v]
+        return v
+
+    heap = [-1] * v_count
+    for k, (u, v, _) in enumerate(edges):
+        if u != v and v != root:
+            heap[v] = merge(heap[v], k)
+
+    seen = [-1] * v_count
+    seen[root] = root
+    in_edge = [-1] * v_count
+    cycles = []
+    for start in range(v_count):
+        curr_v = start
+        path = []
+        path_edges = []
+        while seen[curr_v] == -1:
+            if heap[curr_v] == -1:
+                return None
+            # take the cheapest edge into curr_v and make the remaining ones relative to it
+            e = heap[curr_v]
+            push(e)
+            delta[e] -= key[e]
+            push(e)
+            heap[curr_v] = merge(left[e], right[e])
+            path.append(curr_v)
+            path_edges.append(e)
+            seen[curr_v] = start
+            curr_v = find(edges[e][0])
+            if seen[curr_v] == start:
+                # found a cycle, contract it into a single vertex with the union of its incoming edge heaps
+                cycle_heap = -1
+                end = len(path_edges)
+                history_length = len(history)
+                while True:
+                    # path vertices were roots when pushed, so each heap is merged exactly once
+                    v = path.pop()
+                    cycle_heap = merge(cycle_heap, heap[v])
+                    u, v = find(curr_v), find(v)
+                    if u == v:
+                        break
+                    if size[u] < size[v]:
+                        u, v = v, u
+                    parent[v] = u
+                    size[u] += size[v]
+                    history.append(v)
+                cycles.append((find(curr_v), history_length, path_edges[len(path):end]))
+                del path_edges[len(path):]
+                curr_v = find(curr_v)
+                heap[curr_v] = cycle_heap
+                seen[curr_v] = -1
+        for e in path_edges:
+            in_edge[find(edges[e][1])] = e
+
+    # expand the cycles newest first: every cycle edge is kept except the one into the vertex the cycle is entered at
+    for v, history_length, cycle_edges in reversed(cycles):
+        while len(history) > history_length:
+            u = history.pop()
+            size[parent[u]] -= size[u]
+            parent[u] = u
+        entering = in_edge[v]
+        for e in cycle_edges:
+            in_edge[find(edges[e][1])] = e
+        in_edge[find(edges[entering][1])] = entering
+    return sorted(edges[in_edge[v]] for v in range(v_count) if v != root)
+
 
 if __name__ == '__main__':
 
@@ -315,3 +909,56 @@ if __name__ == '__main__':
     print('\n', g)
     for i in range(5):
         print(f'DIJKSTRA {i} {g.dijkstra(i)}')
+
+    print("\nmethod strongly_connected_components() / condensation() example 1")
+    print("----------------------------------------------------------------")
+    edges = [(0, 1, 10), (4, 0, 12), (1, 4, 15), (4, 3, 3),
+             (3, 1, 5), (2, 1, 23), (3, 2, 7), (5, 6, 2), (6, 5, 4), (5, 0, 9)]
+    g = DirectedGraph(edges)
+    print(g.strongly_connected_components())
+    print(g.condensation())
+    g.remove_edge(3, 1)
+    g.remove_edge(4, 0)
+    print(g.strongly_connected_components())
+    print(g.condensation().get_edges())
+
+    print("\nmethod from_edge_file() / save_snapshot() / load_snapshot() example 1")
+    print("--------------------------------------------------------------------")
+    import os
+    import tempfile
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        csv_path = os.path.join(tmp_dir, 'edges.csv')
+        with open(csv_path, 'w') as csv_file:
+            csv_file.write('# src,dst,weight\n0,1,10\n4,0,12\n1,4,15\n4,3,3\n3,1,5\n2,1,23\n3,2,7\n')
+        g = DirectedGraph.from_edge_file(csv_path)
+        print(g.get_edges())
+        snapshot_path = os.path.join(tmp_dir, 'graph.dgs')
+        g.save_snapshot(snapshot_path)
+        print(os.path.getsize(snapshot_path), DirectedGraph.load_snapshot(snapshot_path).get_edges())
+
+    print("\nmethod iter_dfs() / iter_bfs() example 1")
+    print("----------------------------------------")
+    edges = [(0, 1, 10), (4, 0, 12), (1, 4, 15), (4, 3, 3),
+             (3, 1, 5), (2, 1, 23), (3, 2, 7)]
+    g = DirectedGraph(edges)
+    print(list(g.iter_dfs(2, detail=True)), list(g.iter_bfs(2, detail=True)), sep='\n')
+    bfs_iter = g.iter_bfs(0)
+    print([next(bfs_iter) for _ in range(3)])
+
+    print("\nmethod edge_count() / in_degree() / out_degree() / iter_edges() example 1")
+    print("------------------------------------------------------------------------")
+    edges = [(0, 1, 10), (4, 0, 12), (1, 4, 15), (4, 3, 3),
+             (3, 1, 5), (2, 1, 23), (3, 2, 7)]
+    g = DirectedGraph(edges)
+    g.remove_edge(3, 2)
+    g.add_edge(0, 1, 11)
+    print(g.edge_count(), [g.out_degree(v) for v in g.get_vertices()], [g.in_degree(v) for v in g.get_vertices()])
+    print(next(g.iter_edges()))
+
+    print("\nmethod max_flow() / min_cut() / min_arborescence() example 1")
+    print("------------------------------------------------------------")
+    edges = [(0, 1, 10), (4, 0, 12), (1, 4, 15), (4, 3, 3),
+             (3, 1, 5), (2, 1, 23), (3, 2, 7)]
+    g = DirectedGraph(edges)
+    print(g.max_flow(0, 2), g.min_cut(0, 2))
+    print(g.min_arborescence(0), g.min_arborescence(2))
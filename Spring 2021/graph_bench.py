@@ -0,0 +1,297 @@
+# Course: CS261 - Data Structures
+# Author: Zach Gee
+# Description: Benchmarks for the graph classes and algorithms in d_graph.py and ud_graph.py
+
+import argparse
+import json
+import math
+import random
+import time
+import tracemalloc
+
+from d_graph import DirectedGraph, FlowNetwork, minimum_arborescence
+from ud_graph import CompactUndirectedGraph, UndirectedGraph
+
+
+def erdos_renyi(v_count: int, avg_degree: int, seed: int) -> []:
+    """
+    Returns a seeded Erdos-Renyi style random graph as a list of (source vertex, destination vertex, weight) edges,
+    with about v_count * avg_degree edges picked uniformly at random
+    """
+    rng = random.Random(seed)
+    edges = {}
+    for _ in range(v_count * avg_degree):
+        u, v = rng.randrange(v_count), rng.randrange(v_count)
+        if u != v:
+            edges[(u, v)] = rng.randint(1, 100)
+    return [(u, v, weight) for (u, v), weight in edges.items()]
+
+
+def scale_free(v_count: int, avg_degree: int, seed: int) -> []:
+    """
+    Returns a seeded Barabasi-Albert style scale-free graph. Each new vertex links to avg_degree earlier vertices picked
+    with probability proportional to their degree, so a few hub vertices end up with most of the edges.
+    """
+    rng = random.Random(seed)
+    edges = {}
+    # every edge endpoint is listed once, so a uniform pick from it is a degree-proportional pick of a vertex
+    endpoints = [0]
+    for u in range(1, v_count):
+        for _ in range(avg_degree):
+            v = rng.choice(endpoints)
+            if (u, v) not in edges:
+                edges[(u, v)] = rng.randint(1, 100)
+                endpoints.append(v)
+                endpoints.append(u)
+        endpoints.append(u)
+    return [(u, v, weight) for (u, v), weight in edges.items()]
+
+
+def grid(v_count: int, avg_degree: int, seed: int) -> []:
+    """
+    Returns a seeded square grid graph of about v_count vertices, with edges in both directions between horizontal and
+    vertical neighbors. avg_degree is ignored, every inner vertex has 4 out-neighbors.
+    """
+    rng = random.Random(seed)
+    side = max(1, math.isqrt(v_count))
+    edges = []
+    for row in range(side):
+        for col in range(side):
+            u = row * side + col
+            for v in ((u + 1) if col + 1 < side else None, (u + side) if row + 1 < side else None):
+                if v is not None:
+                    edges.append((u, v, rng.randint(1, 100)))
+                    edges.append((v, u, rng.randint(1, 100)))
+    return edges
+
+
+def dag(v_count: int, avg_degree: int, seed: int) -> []:
+    """
+    Returns a seeded random directed acyclic graph, every edge going from a lower to a higher vertex
+    """
+    rng = random.Random(seed)
+    edges = {}
+    for u in range(v_count - 1):
+        for _ in range(avg_degree):
+            edges[(u, rng.randint(u + 1, v_count - 1))] = rng.randint(1, 100)
+    return [(u, v, weight) for (u, v), weight in edges.items()]
+
+
+def road_network(v_count: int, avg_degree: int, seed: int) -> []:
+    """
+    Returns a seeded road-network-like graph: a grid with jittered vertex positions where some streets are missing
+    and a few diagonal shortcuts are added. Edges go both ways and are weighted by the distance between their
+    endpoints. avg_degree is ignored, road networks have a low, nearly constant degree.
+    """
+    rng = random.Random(seed)
+    side = max(1, math.isqrt(v_count))
+    position = [(col + rng.uniform(-0.3, 0.3), row + rng.uniform(-0.3, 0.3))
+                for row in range(side) for col in range(side)]
+    edges = []
+    for row in range(side):
+        for col in range(side):
+            u = row * side + col
+            neighbors = []
+            if col + 1 < side and rng.random() < 0.9:
+                neighbors.append(u + 1)
+            if row + 1 < side and rng.random() < 0.9:
+                neighbors.append(u + side)
+            if col + 1 < side and row + 1 < side and rng.random() < 0.1:
+                neighbors.append(u + side + 1)
+            for v in neighbors:
+                weight = max(1, round(10 * math.dist(position[u], position[v])))
+                edges.append((u, v, weight))
+                edges.append((v, u, weight))
+    return edges
+
+
+GENERATORS = {
+    'erdos_renyi': erdos_renyi,
+    'scale_free': scale_free,
+    'grid': grid,
+    'dag': dag,
+    'road': road_network,
+}
+
+
+def capacity_network(v_count: int, out_degree: int, seed: int) -> []:
+    """
+    Returns a seeded random network as a list of (source vertex, destination vertex, capacity) edges. Vertex 0 is the
+    source and vertex v_count - 1 the sink; every vertex gets out_degree edges, mostly to vertices with a higher index so
+    there are long source-to-sink paths as well as some back edges.
+    """
+    rng = random.Random(seed)
+    edges = {}
+    for u in range(v_count - 1):
+        for _ in range(out_degree):
+            if rng.random() < 0.9:
+                v = rng.randint(u + 1, min(v_count - 1, u + 50))
+            else:
+                v = rng.randrange(v_count)
+            if v != u:
+                edges[(u, v)] = rng.randint(1, 100)
+    return [(u, v, capacity) for (u, v), capacity in edges.items()]
+
+
+def time_call(function, *args):
+    """
+    Calls function with the provided arguments and returns (seconds taken, return value)
+    """
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def measure_memory(function, *args) -> ():
+    """
+    Calls function with the provided arguments under tracemalloc and returns (bytes still allocated afterwards, peak
+    bytes allocated during the call). With a constructor this is the memory the new object holds on to, and the most
+    it needed while being built.
+    """
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        result = function(*args)
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return current - baseline, peak - baseline
+
+
+def undirected_edges(edges: []) -> []:
+    """
+    Converts (source vertex, destination vertex, weight) edges to the (u, v) string vertex pairs UndirectedGraph takes,
+    keeping one pair per unordered edge
+    """
+    pairs = {}
+    for u, v, _ in edges:
+        pairs.setdefault((min(u, v), max(u, v)), (str(u), str(v)))
+    return list(pairs.values())
+
+
+def build_compact(start_edges: []) -> CompactUndirectedGraph:
+    """
+    Builds a CompactUndirectedGraph straight from the provided edges, without an UndirectedGraph in between
+    """
+    return CompactUndirectedGraph.from_edges(start_edges)
+
+
+def bench_graph(graph: str, family: str, v_count: int, avg_degree=4, seed=0, repeat=1, skip=()) -> {}:
+    """
+    Builds a DirectedGraph (graph='directed'), UndirectedGraph (graph='undirected') or CompactUndirectedGraph
+    (graph='compact', built with CompactUndirectedGraph.from_edges()) from a generated graph and times
+    construction, get_edges(), dfs(), bfs(), has_cycle() and dijkstra(), keeping the fastest of repeat runs. Operations
+    the class doesn't have, or that are listed in skip, are recorded as None. Memory is measured in a separate
+    construction so tracemalloc doesn't slow down the timed runs.
+    """
+    edges = GENERATORS[family](v_count, avg_degree, seed)
+    if graph == 'directed':
+        build, start_edges, start = DirectedGraph, edges, 0
+    elif graph == 'undirected':
+        build, start_edges, start = UndirectedGraph, undirected_edges(edges), '0'
+    else:
+        build, start_edges, start = build_compact, undirected_edges(edges), '0'
+    record = {'graph': None, 'family': family, 'vertices': v_count, 'edges': len(start_edges),
+              'avg_degree': avg_degree, 'seed': seed}
+    record['memory_bytes'], record['peak_memory_bytes'] = measure_memory(build, start_edges)
+
+    build_times = []
+    for _ in range(repeat):
+        seconds, g = time_call(build, start_edges)
+        build_times.append(seconds)
+    record['graph'] = type(g).__name__
+    record['construct_s'] = min(build_times)
+    operations = {'get_edges': (), 'dfs': (start,), 'bfs': (start,), 'has_cycle': (), 'dijkstra': (start,)}
+    for name, args in operations.items():
+        if name in skip or not hasattr(g, name):
+            record[name + '_s'] = None
+            continue
+        record[name + '_s'] = min(time_call(getattr(g, name), *args)[0] for _ in range(repeat))
+    return record
+
+
+def bench_max_flow(v_count: int, out_degree=5, seed=0) -> {}:
+    """
+    Times building a FlowNetwork of v_count vertices and running max_flow() and source_side() on it
+    """
+    edges = capacity_network(v_count, out_degree, seed)
+    network = FlowNetwork(v_count)
+    build_seconds, _ = time_call(lambda: [network.add_edge(u, v, c) for u, v, c in edges])
+    flow_seconds, flow = time_call(network.max_flow, 0, v_count - 1)
+    cut_seconds, source_side = time_call(network.source_side, 0)
+    return {'vertices': v_count, 'edges': len(edges), 'flow': flow, 'build_s': build_seconds,
+            'max_flow_s': flow_seconds, 'min_cut_s': cut_seconds, 'source_side': len(source_side)}
+
+
+def bench_min_arborescence(v_count: int, out_degree=5, seed=0) -> {}:
+    """
+    Times minimum_arborescence() rooted at vertex 0 on a network of v_count vertices
+    """
+    edges = capacity_network(v_count, out_degree, seed)
+    # make sure every vertex is reachable from the root
+    edges += [(u, u + 1, 1000) for u in range(v_count - 1)]
+    seconds, tree = time_call(minimum_arborescence, v_count, 0, edges)
+    return {'vertices': v_count, 'edges': len(edges), 'tree_weight': sum(w for _, _, w in tree),
+            'min_arborescence_s': seconds}
+
+
+def bench_directed_graph_flow(v_count: int, out_degree=5, seed=0) -> {}:
+    """
+    Times DirectedGraph.min_cut() and DirectedGraph.min_arborescence(), which derive their engines' input from the
+    graph's edge index. Sizes are limited by the graph's V x V adjacency matrix.
+    """
+    graph = DirectedGraph(capacity_network(v_count, out_degree, seed))
+    cut_seconds, (flow, _, cut_edges) = time_call(graph.min_cut, 0, v_count - 1)
+    tree_seconds, tree = time_call(graph.min_arborescence, 0)
+    return {'vertices': v_count, 'edges': graph.edge_count(), 'flow': flow, 'cut_edges': len(cut_edges),
+            'min_cut_s': cut_seconds, 'tree_edges': len(tree), 'min_arborescence_s': tree_seconds}
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description="Benchmark the graph classes on generated graphs")
+    parser.add_argument('--graphs', nargs='+', choices=('directed', 'undirected', 'compact'),
+                        default=['directed', 'undirected', 'compact'])
+    parser.add_argument('--families', nargs='+', choices=tuple(GENERATORS), default=list(GENERATORS))
+    parser.add_argument('--sizes', nargs='+', type=int, default=[100, 200, 400, 800])
+    parser.add_argument('--degree', type=int, default=4, help='average out-degree for the random families')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=1, help='timed runs per operation, the fastest is kept')
+    parser.add_argument('--budget', type=float, default=1.0,
+                        help='seconds; an operation slower than this is skipped for larger sizes of the same graph')
+    parser.add_argument('--backend', default='baseline', help='label stored with every result, e.g. a storage backend')
+    parser.add_argument('--output', help='write the results to this JSON file')
+    parser.add_argument('--flow', action='store_true', help='also run the max-flow and arborescence benchmarks')
+    arguments = parser.parse_args()
+
+    results = []
+    for graph in arguments.graphs:
+        for family in arguments.families:
+            # operations that went over budget, these would only get slower on the larger sizes
+            skip = set()
+            for size in sorted(arguments.sizes):
+                record = bench_graph(graph, family, size, arguments.degree, arguments.seed, arguments.repeat, skip)
+                skip.update(key[:-2] for key, seconds in record.items()
+                            if key.endswith('_s') and seconds is not None and seconds > arguments.budget)
+                record['backend'] = arguments.backend
+                results.append(record)
+                print(record)
+
+    if arguments.output is not None:
+        with open(arguments.output, 'w') as output_file:
+            json.dump({'backend': arguments.backend, 'results': results}, output_file, indent=2)
+
+    if arguments.flow:
+        print("\nFlowNetwork.max_flow() / source_side()")
+        print("--------------------------------------")
+        for size in (10000, 20000, 50000):
+            print(bench_max_flow(size))
+        print("\nminimum_arborescence()")
+        print("----------------------")
+        for size in (10000, 20000, 50000):
+            print(bench_min_arborescence(size))
+        print("\nDirectedGraph.min_cut() / min_arborescence()")
+        print("--------------------------------------------")
+        for size in (500, 1000, 2000):
+            print(bench_directed_graph_flow(size))
@@ -3,6 +3,207 @@
 # Description: Program simulates a slightly simplified version of the game Janggi.
 #               See rules at https://en.wikipedia.org/wiki/Janggi
 
+import random
+
+ORTHOGONAL_DIRECTIONS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+COLUMNS = 'abcdefghi'
+
+# Squares are numbered col * 10 + row (so [2,6], 'c7', is square 26) and every table below is a list indexed by square
+SQUARE_COUNT = 90
+SQUARE_NAMES = [COLUMNS[square // 10] + str(square % 10 + 1) for square in range(SQUARE_COUNT)]
+SQUARE_INDEX = {name: square for square, name in enumerate(SQUARE_NAMES)}
+PALACE_CENTERS = {'red': 41, 'blue': 48}
+PALACES = {color: frozenset(center + d_col * 10 + d_row for d_col in (-1, 0, 1) for d_row in (-1, 0, 1))
+           for color, center in PALACE_CENTERS.items()}
+
+# On the compact board every square holds a small int: EMPTY, or the piece type in the low three bits plus BLUE for the
+# blue player's pieces
+EMPTY = 0
+GENERAL, GUARD, HORSE, ELEPHANT, CHARIOT, CANNON, SOLDIER = range(1, 8)
+PIECE_TYPE_MASK = 7
+BLUE = 8
+COLOR_BITS = {'red': 0, 'blue': BLUE}
+PIECE_TYPE_NAMES = ('', 'Ge', 'Gu', 'Ho', 'El', 'Ch', 'Ca', 'So')
+# the display_board name of each piece code (ie. 'BGe' for blue player's General)
+PIECE_NAMES = [('B' if code & BLUE else 'R') + PIECE_TYPE_NAMES[code & PIECE_TYPE_MASK]
+               if code & PIECE_TYPE_MASK else '' for code in range(16)]
+
+
+def compact_board(board):
+    """
+    Returns board as a compact board, a piece code per square. A compact board (bytes or bytearray) is returned as it
+    is, a BoardView gives the compact board behind it, and a board in the original form (9 columns of 10 Piece
+    objects or '') is converted.
+    """
+
+    if isinstance(board, (bytes, bytearray)):
+        return board
+    if isinstance(board, BoardView):
+        return board.get_squares()
+    return bytes(EMPTY if piece == '' or piece is None else piece.get_code() for column in board for piece in column)
+
+
+def on_board(col, row):
+    """
+    Returns True if the coordinates (col, row) are on the game board, False otherwise
+    """
+
+    return 0 <= col < 9 and 0 <= row < 10
+
+
+def palace_diagonal_rays():
+    """
+    Returns a list with, for each square, the rays along the palace diagonals starting there (tuples of squares in the
+    order a Chariot or Cannon passes them): from a corner through the center to the opposite corner, or from the center
+    out to each corner. Squares off the palace diagonals have no rays.
+    """
+
+    rays = [() for square in range(SQUARE_COUNT)]
+    for center in PALACE_CENTERS.values():
+        # listed so that corners i and i ^ 1 are opposite each other
+        corners = [center - 11, center + 11, center + 9, center - 9]
+        rays[center] = tuple((corner,) for corner in corners)
+        for i, corner in enumerate(corners):
+            rays[corner] = ((center, corners[i ^ 1]),)
+    return rays
+
+
+def palace_step_targets(color):
+    """
+    Returns the one-space moves of the General and the Guards of the passed color for each square: the orthogonal steps
+    and palace diagonal steps that end inside the player's palace
+    """
+
+    palace = PALACES[color]
+    targets = []
+    for square in range(SQUARE_COUNT):
+        col, row = divmod(square, 10)
+        steps = {(col + d_col) * 10 + row + d_row for d_col, d_row in ORTHOGONAL_DIRECTIONS
+                 if on_board(col + d_col, row + d_row)}
+        steps.update(ray[0] for ray in PALACE_DIAGONAL_RAYS[square])
+        targets.append(frozenset(steps & palace))
+    return targets
+
+
+def soldier_step_targets(color):
+    """
+    Returns the moves of a Soldier of the passed color for each square: one space forward or to either side, plus the
+    forward palace diagonal steps inside the other player's palace
+    """
+
+    forward = 1 if color == 'red' else -1
+    opposing_palace = PALACES['blue' if color == 'red' else 'red']
+    targets = []
+    for square in range(SQUARE_COUNT):
+        col, row = divmod(square, 10)
+        steps = {(col + d_col) * 10 + row + d_row for d_col, d_row in ((-1, 0), (1, 0), (0, forward))
+                 if on_board(col + d_col, row + d_row)}
+        if square in opposing_palace:
+            steps.update(ray[0] for ray in PALACE_DIAGONAL_RAYS[square] if ray[0] % 10 - row == forward)
+        targets.append(frozenset(steps))
+    return targets
+
+
+def leaper_moves(diagonal_steps):
+    """
+    Returns, for each square, the moves of a piece that makes one orthogonal step and then diagonal_steps diagonal steps
+    outward (1 for the Horse, 2 for the Elephant) and cannot jump, as a dictionary from each destination square to the
+    tuple of squares passed on the way, which must be empty for the move
+    """
+
+    moves = []
+    for square in range(SQUARE_COUNT):
+        col, row = divmod(square, 10)
+        targets = {}
+        for d_col, d_row in ORTHOGONAL_DIRECTIONS:
+            # the diagonal part continues outward, to either side of the first step
+            for side in (-1, 1):
+                path = [(col + d_col + i * (d_col + side * d_row), row + d_row + i * (d_row + side * d_col))
+                        for i in range(diagonal_steps + 1)]
+                if on_board(*path[-1]):
+                    squares = [c * 10 + r for c, r in path]
+                    targets[squares[-1]] = tuple(squares[:-1])
+        moves.append(targets)
+    return moves
+
+
+def line_rays():
+    """
+    Returns the lines of squares a Chariot or Cannon moves along from each square: the four orthogonal directions out
+    to the edge of the board, plus the palace diagonals if the square is on one
+    """
+
+    rays = []
+    for square in range(SQUARE_COUNT):
+        col, row = divmod(square, 10)
+        square_rays = []
+        for d_col, d_row in ORTHOGONAL_DIRECTIONS:
+            ray = []
+            c, r = col + d_col, row + d_row
+            while on_board(c, r):
+                ray.append(c * 10 + r)
+                c, r = c + d_col, r + d_row
+            if ray:
+                square_rays.append(tuple(ray))
+        rays.append(tuple(square_rays) + PALACE_DIAGONAL_RAYS[square])
+    return rays
+
+
+def reverse_moves(moves):
+    """
+    Returns, for each square, the squares a piece can reach it from according to moves (a move table like HORSE_MOVES),
+    as a dictionary from each starting square to the tuple of squares passed on the way. Used to find the pieces
+    attacking a square, such as the pieces checking a General.
+    """
+
+    sources = [{} for square in range(SQUARE_COUNT)]
+    for square, targets in enumerate(moves):
+        for target, legs in targets.items():
+            sources[target][square] = legs
+    return sources
+
+
+PALACE_DIAGONAL_RAYS = palace_diagonal_rays()
+STEP_TARGETS = {
+    'Ge': {color: palace_step_targets(color) for color in PALACES},
+    'So': {color: soldier_step_targets(color) for color in PALACES},
+}
+STEP_TARGETS['Gu'] = STEP_TARGETS['Ge']
+HORSE_MOVES = leaper_moves(1)
+ELEPHANT_MOVES = leaper_moves(2)
+LINE_RAYS = line_rays()
+# for each square, the squares lying between it and every square a line of LINE_RAYS reaches
+LINE_BETWEEN = [{ray[i]: ray[:i] for ray in rays for i in range(len(ray))} for rays in LINE_RAYS]
+# for each square, the ray of LINE_RAYS that every square on a line from it lies on
+LINE_RAY_OF = [{square: ray for ray in rays for square in ray} for rays in LINE_RAYS]
+# the reverse tables: for each square, the squares a piece of that type (and color) attacks it from
+STEP_SOURCES = {piece_type: {color: reverse_moves([dict.fromkeys(square_targets, ()) for square_targets in targets])
+                             for color, targets in colors.items()}
+                for piece_type, colors in STEP_TARGETS.items()}
+HORSE_SOURCES = reverse_moves(HORSE_MOVES)
+ELEPHANT_SOURCES = reverse_moves(ELEPHANT_MOVES)
+# for each square, the squares a Horse or Elephant attacking it passes on the way
+LEAPER_LEGS = [frozenset(leg for sources in (HORSE_SOURCES, ELEPHANT_SOURCES) for legs in sources[square].values()
+                         for leg in legs) for square in range(SQUARE_COUNT)]
+
+
+def zobrist_keys(seed=2021):
+    """
+    Returns the random 64-bit Zobrist keys used to hash positions: a list for each piece code of a key per square, and
+    the key for blue to move. A position's hash is the XOR of the keys of its pieces on their squares and, if it is
+    blue's turn, the blue to move key. The fixed seed gives the same hashes in every run, so they can be stored.
+    """
+
+    generator = random.Random(seed)
+    piece_keys = [[generator.getrandbits(64) for square in range(SQUARE_COUNT)] for code in range(16)]
+    return piece_keys, generator.getrandbits(64)
+
+
+ZOBRIST_PIECE_KEYS, ZOBRIST_BLUE_TO_MOVE = zobrist_keys()
+# the kinds of bound a TranspositionTable entry's value is
+EXACT, LOWER_BOUND, UPPER_BOUND = 0, 1, 2
+
+
 class JanggiGame:
     """
     Holds the general data and methods of the game. Keeps track of the game board, the Piece objects that are still
@@ -11,16 +212,26 @@ class JanggiGame:
     interact with all of the classes inherited from Piece, as the Piece objects are what occupy the game board
     """
 
-    def __init__(self):
+    def __init__(self, checkmate_table=None):
         """
         Creates an instance of a Janggi game. Sets up the game board with all the pieces at their starting locations.
         Begins game on Blue's turn.
+        :param checkmate_table: optional TranspositionTable in which checkmate remembers its results, which can be
+        shared by many games (ie. when replaying a game database)
         """
 
         self._turn = 'blue'
-        self._active_pieces = {'blue': [], 'red': []}
+        # each player's active pieces, kept as the keys of a dictionary so a piece can be removed and put back in O(1)
+        self._active_pieces = {'blue': {}, 'red': {}}
+        self._generals = {}
         self._game_state = 'UNFINISHED'
-        self._board = [['' for j in range(10)] for i in range(9)]
+        # the compact board: a piece code per square, plus the Piece object on each square (None if empty)
+        self._squares = bytearray(SQUARE_COUNT)
+        self._pieces = [None] * SQUARE_COUNT
+        # the board in its original form of 9 columns of 10 rows holding Piece objects or ''
+        self._board = BoardView(self._pieces, self._squares)
+        # one record per move made with push_move, for pop_move to undo it
+        self._move_stack = []
 
         # add pieces to the board
         self.add_piece('red', Chariot, 'a1')
@@ -56,6 +267,13 @@ class JanggiGame:
         self.add_piece('blue', Soldier, 'g7')
         self.add_piece('blue', Soldier, 'i7')
 
+        # the opposing pieces attacking each player's General, kept up to date by push_move and pop_move
+        self._checkers = {color: self._find_checkers(color) for color in ('blue', 'red')}
+        # the Zobrist hash of the position, and how many times each position of the game has occurred
+        self._hash = self.compute_hash()
+        self._position_counts = {self._hash: 1}
+        self._checkmate_table = checkmate_table
+
     def add_piece(self, color, piece_type, location):
         """
         Adds a piece to the board and _active_pieces
@@ -67,8 +285,11 @@ class JanggiGame:
 
         coordinates = self.translate_to_grid(location)
         piece_to_add = piece_type(color, coordinates)
-        self._board[coordinates[0]][coordinates[1]] = piece_to_add
-        self._active_pieces[color].append(piece_to_add)
+        self._squares[piece_to_add.get_square()] = piece_to_add.get_code()
+        self._pieces[piece_to_add.get_square()] = piece_to_add
+        self._active_pieces[color][piece_to_add] = None
+        if piece_type is General:
+            self._generals[color] = piece_to_add
         return
 
     def get_game_state(self):
@@ -78,6 +299,13 @@ class JanggiGame:
 
         return self._game_state
 
+    def get_turn(self):
+        """
+        Returns the player whose turn it is ('red' or 'blue')
+        """
+
+        return self._turn
+
     def is_in_check(self, color):
         """
         Determines if a player is in check.
@@ -85,9 +313,7 @@ class JanggiGame:
         :return: True if the player is in check, False if they are not
         """
 
-        for piece in self._active_pieces[color]:
-            if type(piece) == General:
-                return piece.get_in_check()
+        return self.get_general(color).get_in_check()
 
     def make_move(self, move_from, move_to):
         """
@@ -103,62 +329,257 @@ class JanggiGame:
         from_row = from_coordinates[1]
         to_col = to_coordinates[0]
         to_row = to_coordinates[1]
-        value_at_from = self._board[from_col][from_row]
-        value_at_to = self._board[to_col][to_row]
+        if not (on_board(from_col, from_row) and on_board(to_col, to_row)):
+            return False
+        from_square = from_col * 10 + from_row
+        to_square = to_col * 10 + to_row
+        value_at_from = self._pieces[from_square]
+        value_at_to = self._pieces[to_square]
 
         # if player passes the same square value for both move_from and move_to, then they are passing their turn
         # which they however cannot do if they are in check
         if not self.is_in_check(self._turn) and move_from == move_to:
-            if self._turn == 'red':
-                self._turn = 'blue'
-            else:
-                self._turn = 'red'
+            self.push_move(from_square, from_square)
             return True
 
         # if game isn't over yet and move_from location holds a piece
-        if (self.get_game_state() == 'UNFINISHED' and issubclass(type(value_at_from), Piece) and
+        if (self.get_game_state() == 'UNFINISHED' and value_at_from is not None and
                 # and that piece belongs to the player whose turn it is
                 self._turn == value_at_from.get_color() and
                 # and the movement pattern is valid for that piece
-                value_at_from.validate_move(move_from, move_to, self._board)):
+                value_at_from.validate_squares(from_square, to_square, self._squares)):
             # if there's a piece belonging to the player whose turn it is at move_to (attempting to capture own piece)
-            if issubclass(type(value_at_to), Piece) and self._turn == value_at_to.get_color():
+            if value_at_to is not None and self._turn == value_at_to.get_color():
                 return False
             else:
-                # Make the move
-                # if move_to holds an opposing piece, it gets captured
-                if issubclass(type(value_at_to), Piece):
-                    self.remove_piece(value_at_to)
-                value_at_from.set_location(move_to)
-                self._board[to_col][to_row] = value_at_from
-                self._board[from_col][from_row] = ''
+                # Make the move (capturing an opposing piece at move_to) and change to the other player's turn
+                self.push_move(from_square, to_square)
+                opposing_player = self._turn
                 # whether the player was already in check or this move placed them in check, they cannot now be in check
-                if type(self.is_a_player_in_check(self._turn)) is General and self.is_a_player_in_check(self._turn).get_color() == self._turn:
+                if self._checkers[value_at_from.get_color()]:
                     # Revert the move and return False since the player did not bring themself out of check
-                    self._board[from_col][from_row] = value_at_from
-                    self._board[to_col][to_row] = value_at_to
-                    value_at_from.set_location(move_from)
-                    if issubclass(type(value_at_to), Piece):
-                        self._active_pieces[value_at_to.get_color()].append(value_at_to)
+                    self.pop_move()
                     return False
-                # the player either already wasn't or now isn't in check, so set its General to not in check
-                self.get_general(self._turn).set_in_check(False)
-                # if opposing general was put in check, set its in_check status to True and see if checkmate
-                if type(self.is_a_player_in_check(self._turn)) is General:
-                    self.is_a_player_in_check(self._turn).set_in_check(True)
-                    if self.checkmate(self.is_a_player_in_check(self._turn)):
-                        if self._turn == 'red':
-                            self._game_state = 'RED_WON'
-                        else:
-                            self._game_state = 'BLUE_WON'
-                # turn complete, change to other player's turn
-                if self._turn == 'red':
-                    self._turn = 'blue'
-                else:
-                    self._turn = 'red'
+                # if opposing general was put in check, see if checkmate
+                if self._checkers[opposing_player] and self.checkmate(self.get_general(opposing_player)):
+                    if opposing_player == 'blue':
+                        self._game_state = 'RED_WON'
+                    else:
+                        self._game_state = 'BLUE_WON'
                 return True
         return False
 
+    def push_move(self, from_square, to_square):
+        """
+        Makes a move for the player whose turn it is without validating it, and records it on the move stack so that
+        pop_move can undo it. Any opposing piece at to_square is captured, the checkers of both Generals and their in_check
+        statuses are updated, and the turn passes to the other player. A move with from_square equal to to_square is a
+        pass. Used by make_move and checkmate, and by search and replay tools that need to undo moves.
+        :param from_square: starting square number (col * 10 + row, ie. 30 for 'd1')
+        :param to_square: ending square number
+        :return: none
+        """
+
+        squares = self._squares
+        pieces = self._pieces
+        captured = pieces[to_square]
+        self._move_stack.append((from_square, to_square, captured, self._checkers, self._turn, self._game_state,
+                                 self._generals['red'].get_in_check(), self._generals['blue'].get_in_check(),
+                                 self._hash))
+
+        key = self._hash ^ ZOBRIST_BLUE_TO_MOVE
+        if from_square != to_square:
+            piece = pieces[from_square]
+            piece_keys = ZOBRIST_PIECE_KEYS[squares[from_square]]
+            key ^= piece_keys[from_square] ^ piece_keys[to_square]
+            if captured is not None:
+                key ^= ZOBRIST_PIECE_KEYS[squares[to_square]][to_square]
+                del self._active_pieces[captured.get_color()][captured]
+            piece.set_location([to_square // 10, to_square % 10])
+            squares[to_square] = squares[from_square]
+            squares[from_square] = EMPTY
+            pieces[to_square] = piece
+            pieces[from_square] = None
+            self._checkers = {color: self._updated_checkers(color, from_square, to_square) for color in self._checkers}
+            for color in self._checkers:
+                self._generals[color].set_in_check(len(self._checkers[color]) > 0)
+
+        self._turn = 'blue' if self._turn == 'red' else 'red'
+        self._hash = key
+        self._position_counts[key] = self._position_counts.get(key, 0) + 1
+
+    def pop_move(self):
+        """
+        Undoes the last move made with push_move, putting back the moved piece and any captured piece and restoring the
+        checkers, in_check statuses, game state, turn and hash from before the move.
+        :return: none
+        """
+
+        (from_square, to_square, captured, checkers, turn, game_state,
+         red_in_check, blue_in_check, key) = self._move_stack.pop()
+
+        if self._position_counts[self._hash] == 1:
+            del self._position_counts[self._hash]
+        else:
+            self._position_counts[self._hash] -= 1
+        self._hash = key
+
+        if from_square != to_square:
+            squares = self._squares
+            pieces = self._pieces
+            piece = pieces[to_square]
+            piece.set_location([from_square // 10, from_square % 10])
+            squares[from_square] = squares[to_square]
+            pieces[from_square] = piece
+            if captured is None:
+                squares[to_square] = EMPTY
+                pieces[to_square] = None
+            else:
+                squares[to_square] = captured.get_code()
+                pieces[to_square] = captured
+                self._active_pieces[captured.get_color()][captured] = None
+
+        self._checkers = checkers
+        self._turn = turn
+        self._game_state = game_state
+        self._generals['red'].set_in_check(red_in_check)
+        self._generals['blue'].set_in_check(blue_in_check)
+
+    def legal_moves(self):
+        """
+        Returns every legal move of the player whose turn it is, as (move_from, move_to) pairs in algebraic notation that
+        make_move accepts (ie. ('a7', 'a6')). Passing, allowed when the player is not in check, is not listed. Once the
+        game has been won there are no legal moves.
+        :return: list of (move_from, move_to) tuples
+        """
+
+        if self._game_state != 'UNFINISHED':
+            return []
+        return [(SQUARE_NAMES[from_square], SQUARE_NAMES[to_square])
+                for from_square, to_square in self.legal_move_squares()]
+
+    def legal_move_squares(self):
+        """
+        Returns the legal moves of the player whose turn it is as (from_square, to_square) pairs, whatever the game
+        state. The pieces generate their moves, and only the moves that can leave the player's General attacked are tested
+        with _exposes_general: all of them while in check, moves of the General, and otherwise moves from or to a square
+        on a Chariot/Cannon line from the General (a pin or a new Cannon screen) or from a square a Horse or Elephant
+        would pass to attack it.
+        """
+
+        color = self._turn
+        general = self._generals[color]
+        lines = LINE_RAY_OF[general.get_square()]
+        legs = LEAPER_LEGS[general.get_square()]
+        in_check = len(self._checkers[color]) > 0
+        moves = []
+        for piece in self._active_pieces[color]:
+            from_square = piece.get_square()
+            test_all = in_check or piece is general or from_square in lines or from_square in legs
+            for to_col, to_row in piece.generate_moves(self._squares):
+                to_square = to_col * 10 + to_row
+                if (test_all or to_square in lines) and self._exposes_general(from_square, to_square):
+                    continue
+                moves.append((from_square, to_square))
+        return moves
+
+    def _exposes_general(self, from_square, to_square):
+        """
+        Returns True if moving the piece at from_square to to_square would leave its player's General attacked. The
+        move is made on the board only for as long as it takes to update the General's checkers.
+        """
+
+        squares = self._squares
+        pieces = self._pieces
+        piece = pieces[from_square]
+        captured_code = squares[to_square]
+        captured = pieces[to_square]
+        piece.set_location([to_square // 10, to_square % 10])
+        squares[to_square] = squares[from_square]
+        squares[from_square] = EMPTY
+        pieces[to_square] = piece
+        pieces[from_square] = None
+
+        exposed = len(self._updated_checkers(piece.get_color(), from_square, to_square)) > 0
+
+        piece.set_location([from_square // 10, from_square % 10])
+        squares[from_square] = squares[to_square]
+        squares[to_square] = captured_code
+        pieces[from_square] = piece
+        pieces[to_square] = captured
+        return exposed
+
+    def perft(self, depth, divide=False):
+        """
+        Counts the positions reached by every sequence of depth legal moves from the current position (passes left
+        out), the standard test of move generation. With divide, the count below each legal move of the current position
+        is printed too (ie. 'a7a6: 812'), for comparing two move generators.
+        :param depth: number of moves (plies) to play out
+        :param divide: True to print the count for each first move
+        :return: number of positions
+        """
+
+        if depth == 0:
+            return 1
+        total = 0
+        for from_square, to_square in self.legal_move_squares():
+            if depth == 1:
+                nodes = 1
+            else:
+                self.push_move(from_square, to_square)
+                nodes = self.perft(depth - 1)
+                self.pop_move()
+            if divide:
+                print(SQUARE_NAMES[from_square] + SQUARE_NAMES[to_square] + ':', nodes)
+            total += nodes
+        return total
+
+    def compute_hash(self):
+        """
+        Computes the Zobrist hash of the current position from scratch (see zobrist_keys). push_move and pop_move keep
+        the hash up to date incrementally, so this is only needed to set it up or check it.
+        :return: 64-bit int
+        """
+
+        key = ZOBRIST_BLUE_TO_MOVE if self._turn == 'blue' else 0
+        for square, code in enumerate(self._squares):
+            if code != EMPTY:
+                key ^= ZOBRIST_PIECE_KEYS[code][square]
+        return key
+
+    def get_hash(self):
+        """
+        Returns the 64-bit Zobrist hash of the current position (the pieces on their squares and whose turn it is). Equal
+        positions have equal hashes, so it can key a TranspositionTable or deduplicate the positions of many games.
+        """
+
+        return self._hash
+
+    def repetition_count(self):
+        """
+        Returns the number of times the current position (with the same player to move) has occurred in the game,
+        counting the current occurrence, so 1 if it has not been repeated.
+        """
+
+        return self._position_counts[self._hash]
+
+    def get_squares(self):
+        """
+        Returns a copy of the compact board: 90 bytes, one piece code per square (col * 10 + row), EMPTY for an empty
+        square. Cheap to copy, compare and store, for search and game-database tools.
+        """
+
+        return bytes(self._squares)
+
+    def get_move_history(self):
+        """
+        Returns the moves made so far as bytes: the from_square and to_square of each move in turn (a pass repeats its
+        square). Pushing them onto a new JanggiGame with push_move rebuilds the game, repetition history included, so
+        it is a compact way to send a game to another process.
+        """
+
+        return bytes(square for record in self._move_stack for square in record[:2])
+
     @staticmethod
     def translate_to_grid(location):
         """
@@ -188,9 +609,7 @@ class JanggiGame:
         :return: a General object
         """
 
-        for piece in self._active_pieces[color]:
-            if type(piece) is General:
-                return piece
+        return self._generals[color]
 
     def can_checkmate(self, color):
         """
@@ -203,17 +622,118 @@ class JanggiGame:
             opposing_color = 'blue'
         else:
             opposing_color = 'red'
-        general_location = None
 
-        for piece in self._active_pieces[opposing_color]:
-            if type(piece) is General:
-                general_location = self.translate_to_algebraic(piece.get_location())
-                break
-        for piece in self._active_pieces[color]:
-            piece_location = self.translate_to_algebraic(piece.get_location())
-            if piece.validate_move(piece_location, general_location, self._board):
-                return True
-        return False
+        return len(self._find_checkers(opposing_color)) > 0
+
+    def get_active_pieces(self, color):
+        """
+        Returns a list of the passed player's active (not captured) Piece objects
+        :param color: 'red' or 'blue' as the player
+        :return: list of Piece objects
+        """
+
+        return list(self._active_pieces[color])
+
+    def get_checkers(self, color):
+        """
+        Returns a list of the opposing pieces currently attacking the passed player's General (empty if the player is not
+        in check). Kept up to date by make_move.
+        :param color: 'red' or 'blue' as the player
+        :return: list of Piece objects
+        """
+
+        return list(self._checkers[color])
+
+    def _find_checkers(self, color):
+        """
+        Finds the opposing pieces attacking the passed player's General by looking outward from the General's square:
+        along the Chariot/Cannon rays and at the squares the other piece types could attack it from (the reverse move
+        tables)
+        :param color: 'red' or 'blue' as the player
+        :return: list of Piece objects
+        """
+
+        opposing_color = 'blue' if color == 'red' else 'red'
+        opposing_bit = COLOR_BITS[opposing_color]
+        squares = self._squares
+        general_square = self.get_general(color).get_square()
+        checkers = []
+        for ray in LINE_RAYS[general_square]:
+            checkers += self._line_checkers(ray, color)
+        sources = [HORSE_SOURCES, ELEPHANT_SOURCES] + [STEP_SOURCES[piece_type][opposing_color]
+                                                       for piece_type in STEP_SOURCES]
+        for source in sources:
+            for square in source[general_square]:
+                code = squares[square]
+                if (code != EMPTY and code & BLUE == opposing_bit and
+                        self._pieces[square].validate_squares(square, general_square, squares)):
+                    checkers.append(self._pieces[square])
+        return checkers
+
+    def _line_checkers(self, ray, color):
+        """
+        Returns the opposing Chariot or Cannons attacking the passed player's General along ray (from LINE_RAYS of the
+        General's square): a Chariot that is the first piece on the ray, or a Cannon that is the second piece with a
+        screen that is not a Cannon
+        """
+
+        squares = self._squares
+        color_bit = COLOR_BITS[color]
+        checkers = []
+        screen = False
+        for square in ray:
+            code = squares[square]
+            if code == EMPTY:
+                continue
+            if not screen:
+                if code & PIECE_TYPE_MASK == CHARIOT and code & BLUE != color_bit:
+                    checkers.append(self._pieces[square])
+                if code & PIECE_TYPE_MASK == CANNON:
+                    break
+                screen = True
+                continue
+            if code & PIECE_TYPE_MASK == CANNON and code & BLUE != color_bit:
+                checkers.append(self._pieces[square])
+            break
+        return checkers
+
+    def _updated_checkers(self, color, from_square, to_square):
+        """
+        Returns the opposing pieces attacking the passed player's General after a piece moved from from_square to
+        to_square (already made on the board), starting from the _checkers cache of the position before the move. Only
+        the pieces the move can affect are looked at: the cached checkers (which may have been captured or blocked), the
+        moved piece, the Chariots and Cannons on lines through from_square or to_square and the Horses and Elephants
+        whose way passes from_square. If the General itself moved, its checkers are found from scratch.
+        :param color: 'red' or 'blue' as the player
+        :param from_square: starting square number of the move
+        :param to_square: ending square number of the move
+        :return: list of Piece objects
+        """
+
+        squares = self._squares
+        pieces = self._pieces
+        general_square = self.get_general(color).get_square()
+        if general_square == to_square:
+            return self._find_checkers(color)
+
+        checkers = []
+        for piece in self._checkers[color]:
+            square = piece.get_square()
+            if pieces[square] is piece and piece.validate_squares(square, general_square, squares):
+                checkers.append(piece)
+        candidates = [pieces[to_square]]
+        for square in (from_square, to_square):
+            if square in LINE_RAY_OF[general_square]:
+                candidates += self._line_checkers(LINE_RAY_OF[general_square][square], color)
+        for source in (HORSE_SOURCES, ELEPHANT_SOURCES):
+            for square, legs in source[general_square].items():
+                if from_square in legs and pieces[square] is not None:
+                    candidates.append(pieces[square])
+        for piece in candidates:
+            if (piece.get_color() != color and piece not in checkers and
+                    piece.validate_squares(piece.get_square(), general_square, squares)):
+                checkers.append(piece)
+        return checkers
 
     def is_a_player_in_check(self, color):
         """
@@ -240,52 +760,79 @@ class JanggiGame:
 
     def checkmate(self, general_object):
         """
-        Iterates through the passed General's team's pieces and sees if any can make a move that will
-        bring the General out of check.
+        Sees if any piece of the passed General's team can make a move that will bring the General out of check (see
+        _can_escape_check).
         :param general_object: General object of the player we are determining is checkmated
         :return: True if the player is checkmated, False otherwise
         """
 
-        # iterate through each piece on General's team
-        for value_at_from in self._active_pieces[general_object.get_color()]:
-            from_col = value_at_from.get_location()[0]
-            from_row = value_at_from.get_location()[1]
-            move_from = [from_col,from_row]
+        # positions already decided are looked up in the checkmate table (keyed by the hash with the General's player to
+        # move)
+        color = general_object.get_color()
+        table = self._checkmate_table if color == self._turn else None
+        if table is not None:
+            entry = table.lookup(self._hash)
+            if entry is not None:
+                return entry[2]
+
+        checkmated = not self._can_escape_check(color)
+        if table is not None:
+            table.store(self._hash, 0, checkmated)
+        return checkmated
+
+    def _can_escape_check(self, color):
+        """
+        Returns True if any piece of the passed player can make a move after which their General is not in check. Only
+        check evasions are tried: moves of the General, and moves of the other pieces that capture a checker, block its
+        line or its Horse/Elephant leg, or move a Cannon's screen, as every checker needs. Each of these is verified with
+        _exposes_general, which also catches pinned pieces and checks discovered or newly screened by the move.
+        """
 
-            for move_to in value_at_from.possible_moves(self._board):
-                to_col = move_to[0]
-                to_row = move_to[1]
-                value_at_to = self._board[to_col][to_row]
+        squares = self._squares
+        general = self._generals[color]
+        general_square = general.get_square()
+        for to_col, to_row in general.generate_moves(squares):
+            if not self._exposes_general(general_square, to_col * 10 + to_row):
+                return True
 
+        # for each checker, the squares that moving a piece to (capture or block) or from (a Cannon's screen) can end
+        # its attack
+        evasions = []
+        for checker in self._checkers[color]:
+            checker_square = checker.get_square()
+            checker_type = checker.get_code() & PIECE_TYPE_MASK
+            to_squares = {checker_square}
+            from_squares = set()
+            if checker_type == CHARIOT or checker_type == CANNON:
+                to_squares.update(LINE_BETWEEN[checker_square][general_square])
+                if checker_type == CANNON:
+                    from_squares.update(square for square in LINE_BETWEEN[checker_square][general_square]
+                                        if squares[square] != EMPTY)
+            elif checker_type == HORSE:
+                to_squares.update(HORSE_MOVES[checker_square][general_square])
+            elif checker_type == ELEPHANT:
+                to_squares.update(ELEPHANT_MOVES[checker_square][general_square])
+            evasions.append((to_squares, from_squares))
 
-                # if there's a piece of the same color at move_to (attempting to capture own piece)
-                if issubclass(type(value_at_to), Piece) and general_object.get_color() == value_at_to.get_color():
-                    continue
-                else:
-                    # Make the move
-                    # if move_to holds an opposing piece, it gets captured
-                    if issubclass(type(value_at_to), Piece):
-                        self.remove_piece(value_at_to)
-                    value_at_from.set_location(move_to)
-                    self._board[to_col][to_row] = value_at_from
-                    self._board[from_col][from_row] = ''
-                    # if the General is no longer in check
-                    if self.is_a_player_in_check(general_object.get_color()) != general_object:
-                        # Revert the move and return False
-                        self._board[from_col][from_row] = value_at_from
-                        self._board[to_col][to_row] = value_at_to
-                        value_at_from.set_location(move_from)
-                        if issubclass(type(value_at_to), Piece):
-                            self._active_pieces[value_at_to.get_color()].append(value_at_to)
-                        return False
-                    # Revert the move and move on to checking next move
-                    self._board[from_col][from_row] = value_at_from
-                    self._board[to_col][to_row] = value_at_to
-                    value_at_from.set_location(move_from)
-                    if issubclass(type(value_at_to), Piece):
-                        self._active_pieces[value_at_to.get_color()].append(value_at_to)
+        for piece in self._active_pieces[color]:
+            if piece is general:
+                continue
+            from_square = piece.get_square()
+            # the checkers that moving this piece off its square can't end must all be ended by where it moves to
+            targets = None
+            for to_squares, from_squares in evasions:
+                if from_square not in from_squares:
+                    targets = to_squares if targets is None else targets & to_squares
+            if targets is None:
+                to_squares = [to_col * 10 + to_row for to_col, to_row in piece.generate_moves(squares)]
+            else:
+                to_squares = [to_square for to_square in targets if not piece.is_own_piece(squares[to_square]) and
+                              piece.validate_squares(from_square, to_square, squares)]
+            for to_square in to_squares:
+                if not self._exposes_general(from_square, to_square):
+                    return True
 
-        return True
+        return False
 
     def remove_piece(self, piece):
         """
@@ -294,24 +841,153 @@ class JanggiGame:
         :return: none
         """
 
-        self._active_pieces[piece.get_color()].remove(piece)
+        del self._active_pieces[piece.get_color()][piece]
 
     def display_board(self):
         """
         Prints a representation of the state of the game board.
         """
 
-        for i in range(len(self._board[0])):
+        for i in range(10):
             row = ''
-            for j in range(len(self._board)):
-                if self._board[j][i] == '':
+            for j in range(9):
+                if self._squares[j * 10 + i] == EMPTY:
                     row += '  -  '
                 else:
-                    row += ' '+str(self._board[j][i])+' '
+                    row += ' '+PIECE_NAMES[self._squares[j * 10 + i]]+' '
             print(row)
         print('............................................')
 
 
+class BoardView:
+    """
+    Read-only view of a JanggiGame's compact board in its original form, a list of 9 columns of 10 rows: board[col][row]
+    is the Piece object on that square, or '' if the square is empty. Pieces are moved through JanggiGame.
+    """
+
+    def __init__(self, pieces, squares):
+        """
+        Creates the view of a JanggiGame's board from its list of the Piece object (or None) on each square and its
+        compact board
+        """
+
+        self._pieces = pieces
+        self._squares = squares
+
+    def get_squares(self):
+        """
+        Returns the compact board behind the view (not a copy), for the Piece methods that work on compact boards
+        """
+
+        return self._squares
+
+    def __len__(self):
+        """
+        Returns the number of columns of the board
+        """
+
+        return 9
+
+    def __getitem__(self, col):
+        """
+        Returns column col of the board as a list of 10 Piece objects or '' for empty squares
+        """
+
+        col = range(9)[col]
+        return [piece if piece is not None else '' for piece in self._pieces[col * 10:col * 10 + 10]]
+
+
+class TranspositionTable:
+    """
+    Fixed-size table of results for positions, keyed by their Zobrist hash (JanggiGame.get_hash()). Each hash maps to a
+    bucket of two entries: the first keeps the result searched to the greatest depth, and is replaced only by a search
+    at least as deep, a result for the same position or a result from a newer search (see new_search()); the second
+    always takes the newest result that didn't go in the first. Entries are tuples (key, depth, value, flag, move,
+    generation), where flag tells if value is EXACT or a LOWER_BOUND or UPPER_BOUND. Used by JanggiGame.checkmate, by
+    search, and to deduplicate the positions of a game database.
+    """
+
+    def __init__(self, size=1 << 16):
+        """
+        Creates an empty table with room for about size entries (rounded up to a power of two)
+        :param size: number of entries
+        """
+
+        bucket_count = 1
+        while bucket_count * 2 < size:
+            bucket_count *= 2
+        self._mask = bucket_count - 1
+        self._entries = [None] * (bucket_count * 2)
+        self._generation = 0
+
+    def __len__(self):
+        """
+        Returns the number of entries stored
+        """
+
+        return len(self._entries) - self._entries.count(None)
+
+    def __contains__(self, key):
+        """
+        Returns True if there is an entry for the position hash key, False otherwise
+        """
+
+        return self.lookup(key) is not None
+
+    def new_search(self):
+        """
+        Starts a new search generation, so entries of earlier searches give way to new results whatever their depth
+        """
+
+        self._generation += 1
+
+    def lookup(self, key):
+        """
+        Returns the entry stored for the position hash key, or None if there is none
+        """
+
+        index = (key & self._mask) * 2
+        entry = self._entries[index]
+        if entry is not None and entry[0] == key:
+            return entry
+        entry = self._entries[index + 1]
+        if entry is not None and entry[0] == key:
+            return entry
+        return None
+
+    def store(self, key, depth, value, flag=EXACT, move=None):
+        """
+        Stores a result for the position hash key, following the replacement policy of the table.
+        :param key: position hash
+        :param depth: depth the position was searched to (0 for a static result)
+        :param value: result for the position
+        :param flag: EXACT, LOWER_BOUND or UPPER_BOUND
+        :param move: best move found, if any
+        :return: none
+        """
+
+        index = (key & self._mask) * 2
+        entry = (key, depth, value, flag, move, self._generation)
+        deepest = self._entries[index]
+        if deepest is None or deepest[0] == key or depth >= deepest[1] or deepest[5] != self._generation:
+            # a different position moved out of the first entry still gets the second
+            if deepest is not None and deepest[0] != key:
+                self._entries[index + 1] = deepest
+            elif self._entries[index + 1] is not None and self._entries[index + 1][0] == key:
+                self._entries[index + 1] = None
+            self._entries[index] = entry
+        else:
+            self._entries[index + 1] = entry
+
+    def clear(self):
+        """
+        Removes all entries
+        """
+
+        self._entries = [None] * len(self._entries)
+        self._generation = 0
+
+
 class Piece:
     """
     Is the parent class of all the various piece classes that constitute the pieces of the game. Each Piece holds
@@ -328,8 +1004,11 @@ class Piece:
         """
 
         self._color = color
+        self._color_bit = COLOR_BITS[color]
         self._piece_type = None
+        self._code = None
         self._location = location
+        self._square = location[0] * 10 + location[1]
 
     def __repr__(self):
         """
@@ -354,6 +1033,20 @@ class Piece:
 
         return self._location
 
+    def get_square(self):
+        """
+        Returns the number of the square the Piece is on (col * 10 + row), the index into the move tables
+        """
+
+        return self._square
+
+    def get_code(self):
+        """
+        Returns the Piece's code on the compact board (its piece type plus BLUE for the blue player)
+        """
+
+        return self._code
+
     def set_location(self, location):
         """
         Sets the Piece's location on the game board.
@@ -367,13 +1060,32 @@ class Piece:
             location_as_list = JanggiGame.translate_to_grid(location)
 
         self._location = location_as_list
+        self._square = location_as_list[0] * 10 + location_as_list[1]
 
     def validate_move(self, move_from, move_to, board):
         """
-        Each piece will have its own validation method to confirm the proposed movement pattern is valid.
+        Confirms the proposed movement pattern is valid for the piece, using the piece's validate_squares() method.
+        Locations off the game board are never valid.
         :param move_from: starting location (ie. 'd1')
         :param move_to: ending location (ie. 'd2')
-        :param board: the JanggiGame instance's board value
+        :param board: the JanggiGame instance's board, either its BoardView (or another board of 9 columns of 10 Piece
+        objects or '') or its compact board (_squares)
+        :return: True if move is valid, False otherwise
+        """
+
+        from_square = SQUARE_INDEX.get(move_from.lower())
+        to_square = SQUARE_INDEX.get(move_to.lower())
+        if from_square is None or to_square is None:
+            return False
+        return self.validate_squares(from_square, to_square, compact_board(board))
+
+    def validate_squares(self, from_square, to_square, board):
+        """
+        Each piece will have its own validation method to confirm the proposed movement pattern is valid, looking the
+        move up in the piece type's move table.
+        :param from_square: starting square number (ie. 30 for 'd1')
+        :param to_square: ending square number (ie. 31 for 'd2')
+        :param board: the JanggiGame instance's compact board (_squares), a piece code per square
         :return: True if move is valid, False otherwise
         """
 
@@ -381,20 +1093,69 @@ class Piece:
 
     def possible_moves(self, board):
         """
-        Returns list of all possible moves the Piece can make.
-        :param board: JanggiGame instance's _board value
+        Returns list of all possible moves the Piece can make. Squares holding a piece of the same color are left out,
+        as the Piece can never move there.
+        :param board: the JanggiGame instance's board, either its BoardView (or another board of 9 columns of 10 Piece
+        objects or '') or its compact board (_squares)
         :return: List in coordinates (ie. [[3,7], [5,2], [6,6])
         """
 
-        coordinate_list = []
-        algebraic_from = JanggiGame.translate_to_algebraic(self._location)
-        for i, col in enumerate(board):
-            for j, row in enumerate(col):
-                algebraic_to = JanggiGame.translate_to_algebraic([i,j])
-                if self.validate_move(algebraic_from,algebraic_to,board) is True:
-                    coordinate_list.append([i,j])
+        return list(self.generate_moves(compact_board(board)))
+
+    def generate_moves(self, board):
+        """
+        Generator that yields the coordinates of every square the Piece's movement pattern allows it to move to, leaving
+        out squares holding a piece of the same color. Checks for the player's own General are not considered. Each
+        piece type overrides this with a direct walk of its move table; this version tries every square of the board
+        with validate_squares().
+        :param board: JanggiGame instance's compact board (_squares)
+        :return: generator of coordinates (ie. [3,7])
+        """
+
+        from_square = self.get_square()
+        for to_square in range(SQUARE_COUNT):
+            if (not self.is_own_piece(board[to_square]) and
+                    self.validate_squares(from_square, to_square, board) is True):
+                yield [to_square // 10, to_square % 10]
+
+    def is_own_piece(self, value):
+        """
+        Returns True if value (the piece code a compact board square holds) is a Piece of the same color as this Piece,
+        False otherwise
+        """
+
+        return value != EMPTY and value & BLUE == self._color_bit
+
+    def _validate_step(self, from_square, to_square):
+        """
+        Returns True if to_square is one of the piece type's step targets from from_square (General, Guard, Soldier)
+        """
+
+        return to_square in STEP_TARGETS[self._piece_type][self._color][from_square]
+
+    def _generate_steps(self, board):
+        """
+        Yields the piece type's step targets from its square that don't hold a piece of the same color (General, Guard,
+        Soldier)
+        """
+
+        for square in STEP_TARGETS[self._piece_type][self._color][self.get_square()]:
+            if not self.is_own_piece(board[square]):
+                yield [square // 10, square % 10]
+
+    def _generate_leaps(self, board, moves):
+        """
+        Yields the destinations in moves (the Horse or Elephant table) from the Piece's square whose passed squares are
+        all empty and that don't hold a piece of the same color
+        """
 
-        return coordinate_list
+        for to_square, legs in moves[self.get_square()].items():
+            for leg in legs:
+                if board[leg] != EMPTY:
+                    break
+            else:
+                if not self.is_own_piece(board[to_square]):
+                    yield [to_square // 10, to_square % 10]
 
 
 class General(Piece):
@@ -410,54 +1171,28 @@ class General(Piece):
 
         super().__init__(color, location)
         self._piece_type = 'Ge'
+        self._code = GENERAL | self._color_bit
         self._in_check = False
 
-    def validate_move(self, move_from, move_to, board):
+    def validate_squares(self, from_square, to_square, board):
         """
         Validates the proposed move for the piece. A General can move only one space at a time, and must stay within the
         confines of the palace (box confined by d1-f1-d3-f3 for red, and d10-f10-d8-f8 for blue)
-        :param move_from: starting location (ie. d1)
-        :param move_to: ending location (ie. d2)
-        :param board: not used for General, but is necessary place holder as board needed in validate_move for other pieces
+        :param from_square: starting square number (ie. 30 for d1)
+        :param to_square: ending square number (ie. 31 for d2)
+        :param board: not used for General, but is necessary place holder as board needed in validate_squares for other
+        pieces
         :return: True if move is valid, False otherwise
         """
 
-        from_coordinates = JanggiGame.translate_to_grid(move_from)
-        to_coordinates = JanggiGame.translate_to_grid(move_to)
-        from_col = from_coordinates[0]
-        from_row = from_coordinates[1]
-        to_col = to_coordinates[0]
-        to_row = to_coordinates[1]
+        return self._validate_step(from_square, to_square)
 
-        if self._color == 'red':
-            # if destination within the palace:
-            if (to_col in range(3,6) and to_row in range(3) and
-                # and the move is 1 horizontal or 1 vertical:
-                (((abs(to_col-from_col) == 1 and to_row-from_row == 0) or
-                (to_col-from_col == 0 and abs(to_row-from_row) == 1)) or
-                # or the move is one diagonal:
-                ((from_coordinates == [4,1] and to_coordinates in [[3,0],[3,2],[5,0],[5,2]]) or
-                (from_coordinates in [[3,0],[3,2],[5,0],[5,2]] and to_coordinates == [4,1]))
-                )
-            ):
-                return True
-            else:
-                return False
+    def generate_moves(self, board):
+        """
+        Yields the one-space moves within the palace (see Piece.generate_moves())
+        """
 
-        if self._color == 'blue':
-            # if destination within the palace:
-            if (to_col in range(3,6) and to_row in range(7,10) and
-                # and the move is 1 horizontal or 1 vertical:
-                (((abs(to_col-from_col) == 1 and to_row-from_row == 0) or
-                (to_col-from_col == 0 and abs(to_row-from_row) == 1)) or
-                # or the move is one diagonal:
-                ((from_coordinates == [4,8] and to_coordinates in [[3,7],[3,9],[5,7],[5,9]]) or
-                (from_coordinates in [[3,7],[3,9],[5,7],[5,9]] and to_coordinates == [4,8]))
-                )
-            ):
-                return True
-            else:
-                return False
+        return self._generate_steps(board)
 
     def get_in_check(self):
         """
@@ -489,53 +1224,27 @@ class Guard(Piece):
 
         super().__init__(color, location)
         self._piece_type = 'Gu'
+        self._code = GUARD | self._color_bit
 
-    def validate_move(self, move_from, move_to, board):
+    def validate_squares(self, from_square, to_square, board):
         """
         Validates the proposed move for the piece. A guard can only move one space at a time within the confines of its
         fortress (just like a General).
-        :param move_from: starting location (ie. d1)
-        :param move_to: ending location (ie. d2)
-        :param board: not used for Guard, but is necessary place holder as board needed in validate_move for other pieces
+        :param from_square: starting square number (ie. 30 for d1)
+        :param to_square: ending square number (ie. 31 for d2)
+        :param board: not used for Guard, but is necessary place holder as board needed in validate_squares for other
+        pieces
         :return: True if move is valid, False otherwise
         """
 
-        from_coordinates = JanggiGame.translate_to_grid(move_from)
-        to_coordinates = JanggiGame.translate_to_grid(move_to)
-        from_col = from_coordinates[0]
-        from_row = from_coordinates[1]
-        to_col = to_coordinates[0]
-        to_row = to_coordinates[1]
+        return self._validate_step(from_square, to_square)
 
-        if self._color == 'red':
-            # if destination within the palace:
-            if (to_col in range(3, 6) and to_row in range(3) and
-                    # and the move is 1 horizontal or 1 vertical:
-                    (((abs(to_col - from_col) == 1 and to_row - from_row == 0) or
-                      (to_col - from_col == 0 and abs(to_row - from_row) == 1)) or
-                     # or the move is one diagonal:
-                     ((from_coordinates == [4, 1] and to_coordinates in [[3, 0], [3, 2], [5, 0], [5, 2]]) or
-                      (from_coordinates in [[3, 0], [3, 2], [5, 0], [5, 2]] and to_coordinates == [4, 1]))
-                    )
-            ):
-                return True
-            else:
-                return False
+    def generate_moves(self, board):
+        """
+        Yields the one-space moves within the palace (see Piece.generate_moves())
+        """
 
-        if self._color == 'blue':
-            # if destination within the palace:
-            if (to_col in range(3, 6) and to_row in range(7, 10) and
-                    # and the move is 1 horizontal or 1 vertical:
-                    (((abs(to_col - from_col) == 1 and to_row - from_row == 0) or
-                      (to_col - from_col == 0 and abs(to_row - from_row) == 1)) or
-                     # or the move is one diagonal:
-                     ((from_coordinates == [4, 8] and to_coordinates in [[3, 7], [3, 9], [5, 7], [5, 9]]) or
-                      (from_coordinates in [[3, 7], [3, 9], [5, 7], [5, 9]] and to_coordinates == [4, 8]))
-                    )
-            ):
-                return True
-            else:
-                return False
+        return self._generate_steps(board)
 
 
 class Horse(Piece):
@@ -551,36 +1260,28 @@ class Horse(Piece):
 
         super().__init__(color, location)
         self._piece_type = 'Ho'
+        self._code = HORSE | self._color_bit
 
-    def validate_move(self, move_from, move_to, board):
+    def validate_squares(self, from_square, to_square, board):
         """
         Validates the proposed move for the piece. A horse moves one space in any direction and then one space diagonally.
         It does not jump, so the move is invalid if another piece is in the way.
-        :param move_from: starting location (ie. d1)
-        :param move_to: ending location (ie. d2)
-        :param board: the passing JanggiGame instance's _board value
+        :param from_square: starting square number (ie. 30 for d1)
+        :param to_square: ending square number (ie. 31 for d2)
+        :param board: the passing JanggiGame instance's compact board (_squares)
         :return: True if move is valid, False otherwise
         """
 
-        from_coordinates = JanggiGame.translate_to_grid(move_from)
-        to_coordinates = JanggiGame.translate_to_grid(move_to)
-        from_col = from_coordinates[0]
-        from_row = from_coordinates[1]
-        to_col = to_coordinates[0]
-        to_row = to_coordinates[1]
+        legs = HORSE_MOVES[from_square].get(to_square)
+        return legs is not None and board[legs[0]] == EMPTY
 
-        # if destination within the board
-        if (to_col in range(9) and to_row in range(10) and
-        # and the move is 1 up/down/left/right (with no other piece here) and then 1 farther out diagonally
-            ((to_row - from_row == -2 and abs(to_col - from_col) == 1 and board[from_col][from_row - 1] == '') or
-             (to_row - from_row == 2 and abs(to_col - from_col) == 1 and board[from_col][from_row + 1] == '') or
-             (to_col - from_col == -2 and abs(to_row - from_row) == 1 and board[from_col - 1][from_row] == '') or
-             (to_col - from_col == 2 and abs(to_row - from_row) == 1 and board[from_col + 1][from_row] == '')
-            )
-        ):
-            return True
-        else:
-            return False
+    def generate_moves(self, board):
+        """
+        Yields the squares one orthogonal step and then one diagonal step away whose first step square is empty
+        (see Piece.generate_moves())
+        """
+
+        return self._generate_leaps(board, HORSE_MOVES)
 
 
 class Elephant(Piece):
@@ -596,51 +1297,28 @@ class Elephant(Piece):
 
         super().__init__(color, location)
         self._piece_type = 'El'
+        self._code = ELEPHANT | self._color_bit
 
-    def validate_move(self, move_from, move_to, board):
+    def validate_squares(self, from_square, to_square, board):
         """
         Validates the proposed move for the piece. An elephant moves one space in any direction and then two spaces
         diagonally. It does not jump, so is blocked if another piece is in the way.
-        :param move_from: starting location (ie. d1)
-        :param move_to: ending location (ie. d2)
-        :param board: the passing JanggiGame instance's _board value
+        :param from_square: starting square number (ie. 30 for d1)
+        :param to_square: ending square number (ie. 31 for d2)
+        :param board: the passing JanggiGame instance's compact board (_squares)
         :return: True if move is valid, False otherwise
         """
 
-        from_coordinates = JanggiGame.translate_to_grid(move_from)
-        to_coordinates = JanggiGame.translate_to_grid(move_to)
-        from_col = from_coordinates[0]
-        from_row = from_coordinates[1]
-        to_col = to_coordinates[0]
-        to_row = to_coordinates[1]
+        legs = ELEPHANT_MOVES[from_square].get(to_square)
+        return legs is not None and board[legs[0]] == EMPTY and board[legs[1]] == EMPTY
 
-        # if destination within the board
-        if to_col in range(9) and to_row in range(10):
-            # if destination is 1 up and diagonally to the left
-            if to_col - from_col == -2 and to_row - from_row == -3 and board[from_col][from_row - 1] == '' and board[from_col - 1][from_row - 2] == '':
-                return True
-            # if destination is 1 up and diagonally to the right
-            if to_col - from_col == 2 and to_row - from_row == -3 and board[from_col][from_row - 1] == '' and board[from_col + 1][from_row - 2] == '':
-                return True
-            # if destination is 1 down and diagonally to the left
-            if to_col - from_col == -2 and to_row - from_row == 3 and board[from_col][from_row + 1] == '' and board[from_col - 1][from_row + 2] == '':
-                return True
-            # if destination is 1 down and diagonally to the right
-            if to_col - from_col == 2 and to_row - from_row == 3 and board[from_col][from_row + 1] == '' and board[from_col + 1][from_row + 2] == '':
-                return True
-            # if destination is 1 left and diagonally up
-            if to_col - from_col == -3 and to_row - from_row == -2 and board[from_col - 1][from_row] == '' and board[from_col - 2][from_row - 1] == '':
-                return True
-            # if destination is 1 left and diagonally down
-            if to_col - from_col == -3 and to_row - from_row == 2 and board[from_col - 1][from_row] == '' and board[from_col - 2][from_row + 1] == '':
-                return True
-            # if destination is 1 right and diagonally up
-            if to_col - from_col == 3 and to_row - from_row == -2 and board[from_col + 1][from_row] == '' and board[from_col + 2][from_row - 1] == '':
-                return True
-            # if destination is 1 right and diagonally down
-            if to_col - from_col == 3 and to_row - from_row == 2 and board[from_col + 1][from_row] == '' and board[from_col + 2][from_row + 1] == '':
-                return True
-        return False
+    def generate_moves(self, board):
+        """
+        Yields the squares one orthogonal step and then two diagonal steps away, if both squares passed on the way are
+        empty (see Piece.generate_moves())
+        """
+
+        return self._generate_leaps(board, ELEPHANT_MOVES)
 
 
 class Chariot(Piece):
@@ -656,74 +1334,42 @@ class Chariot(Piece):
 
         super().__init__(color, location)
         self._piece_type = 'Ch'
+        self._code = CHARIOT | self._color_bit
 
-    def validate_move(self, move_from, move_to, board):
+    def validate_squares(self, from_square, to_square, board):
         """
         Validates the proposed move for the piece. A Chariot can move unlimited spaces horizontally or vertically until
         it hits a wall or another piece. It can move along the diagonals in the fortresses as well.
-        :param move_from: starting location (ie. d1)
-        :param move_to: ending location (ie. d2)
-        :param board: the passing JanggiGame instance's _board value
+        :param from_square: starting square number (ie. 30 for d1)
+        :param to_square: ending square number (ie. 31 for d2)
+        :param board: the passing JanggiGame instance's compact board (_squares)
         :return: True if move is valid, False otherwise
         """
 
-        from_coordinates = JanggiGame.translate_to_grid(move_from)
-        to_coordinates = JanggiGame.translate_to_grid(move_to)
-        from_col = from_coordinates[0]
-        from_row = from_coordinates[1]
-        to_col = to_coordinates[0]
-        to_row = to_coordinates[1]
-
-        # if destination within the board and the move is strictly horizontal or vertical
-        if to_col in range(9) and to_row in range(10) and (to_col == from_col or to_row == from_row):
-            # if move is to the left
-            if to_col < from_col:
-                # make sure no other piece lies between to and from
-                for col in range(to_col + 1, from_col):
-                    if board[col][to_row] != '':
-                        return False
-                return True
-            # if move is to the right
-            if to_col > from_col:
-                # make sure no other piece lies between to and from
-                for col in range(from_col + 1, to_col):
-                    if board[col][to_row] != '':
-                        return False
-                return True
-            # if move is upward
-            if to_row < from_row:
-                # make sure no other piece lies between to and from
-                for row in range(to_row + 1, from_row):
-                    if board[to_col][row] != '':
-                        return False
-                return True
-            # if move is downward
-            if to_row > from_row:
-                # make sure no other piece lies between to and from
-                for row in range(from_row + 1, to_row):
-                    if board[to_col][row] != '':
-                        return False
-                return True
-
+        between = LINE_BETWEEN[from_square].get(to_square)
+        if between is None:
             return False
+        # make sure no other piece lies between to and from
+        for square in between:
+            if board[square] != EMPTY:
+                return False
+        return True
 
-        # if moving along the diagonals in the red palace
-        if from_coordinates in [[3,0],[3,2],[5,0],[5,2]] and to_coordinates in [[3,0],[3,2],[5,0],[5,2]] and board[4][1] == '':
-            return True
-        if from_coordinates in [[3,0],[3,2],[5,0],[5,2]] and to_coordinates == [4,1]:
-            return True
-        if from_coordinates == [4,1] and to_coordinates in [[3,0],[3,2],[5,0],[5,2]]:
-            return True
-
-        # if moving along the diagonals in the blue palace
-        if from_coordinates in [[3,7],[3,9],[5,7],[5,9]] and to_coordinates in [[3,7],[3,9],[5,7],[5,9]] and board[4][8] == '':
-            return True
-        if from_coordinates in [[3,7],[3,9],[5,7],[5,9]] and to_coordinates == [4,8]:
-            return True
-        if from_coordinates == [4,8] and to_coordinates in [[3,7],[3,9],[5,7],[5,9]]:
-            return True
+    def generate_moves(self, board):
+        """
+        Walks each ray out from the Chariot, yielding empty squares until the first piece, which is yielded too if it
+        belongs to the other player (see Piece.generate_moves())
+        """
 
-        return False
+        for ray in LINE_RAYS[self.get_square()]:
+            for square in ray:
+                value = board[square]
+                if value == EMPTY:
+                    yield [square // 10, square % 10]
+                    continue
+                if not self.is_own_piece(value):
+                    yield [square // 10, square % 10]
+                break
 
 
 class Cannon(Piece):
@@ -739,87 +1385,59 @@ class Cannon(Piece):
 
         super().__init__(color, location)
         self._piece_type = 'Ca'
+        self._code = CANNON | self._color_bit
 
-    def validate_move(self, move_from, move_to, board):
+    def validate_squares(self, from_square, to_square, board):
         """
         Validates the proposed move for the piece. A cannon moves horizontally or vertically in any direction, but can
         only do so if another piece (that is NOT a cannon) is in the way. It cannot hop over or capture another cannon.
-        :param move_from: starting location (ie. d1)
-        :param move_to: ending location (ie. d2)
-        :param board: the passing JanggiGame instance's _board value
+        :param from_square: starting square number (ie. 30 for d1)
+        :param to_square: ending square number (ie. 31 for d2)
+        :param board: the passing JanggiGame instance's compact board (_squares)
         :return: True if move is valid, False otherwise
         """
 
-        from_coordinates = JanggiGame.translate_to_grid(move_from)
-        to_coordinates = JanggiGame.translate_to_grid(move_to)
-        from_col = from_coordinates[0]
-        from_row = from_coordinates[1]
-        to_col = to_coordinates[0]
-        to_row = to_coordinates[1]
-
         # a cannon cannot capture another cannon
-        if type(board[to_col][to_row]) == Cannon:
+        if board[to_square] & PIECE_TYPE_MASK == CANNON:
             return False
 
-        # if destination within the board and the move is strictly horizontal or vertical
-        if to_col in range(9) and to_row in range(10) and (to_col == from_col or to_row == from_row):
-            # if move is to the left
-            if to_col < from_col:
-                # make sure there is exactly one intervening piece that's not a cannon
-                piece_count = 0
-                for col in range(to_col + 1, from_col):
-                    if type(board[col][to_row]) == Cannon:
-                        return False
-                    if issubclass(type(board[col][to_row]), Piece):
-                        piece_count += 1
-                if piece_count == 1:
-                    return True
-            # if move is to the right
-            if to_col > from_col:
-                # make sure there is exactly one intervening piece that's not a cannon
-                piece_count = 0
-                for col in range(from_col + 1, to_col):
-                    if type(board[col][to_row]) == Cannon:
-                        return False
-                    if issubclass(type(board[col][to_row]), Piece):
-                        piece_count += 1
-                if piece_count == 1:
-                    return True
-            # if move is upward
-            if to_row < from_row:
-                # make sure there is exactly one intervening piece that's not a cannon
-                piece_count = 0
-                for row in range(to_row + 1, from_row):
-                    if type(board[to_col][row]) == Cannon:
-                        return False
-                    if issubclass(type(board[to_col][row]), Piece):
-                        piece_count += 1
-                if piece_count == 1:
-                    return True
-            # if move is downward
-            if to_row > from_row:
-                # make sure there is exactly one intervening piece that's not a cannon
-                piece_count = 0
-                for row in range(from_row + 1, to_row):
-                    if type(board[to_col][row]) == Cannon:
-                        return False
-                    if issubclass(type(board[to_col][row]), Piece):
-                        piece_count += 1
-                if piece_count == 1:
-                    return True
+        between = LINE_BETWEEN[from_square].get(to_square)
+        if between is None:
             return False
-
-        # for moving diagonally in the red palace
-        if (from_coordinates in [[3,0],[3,2],[5,0],[5,2]] and to_coordinates in [[3,0],[3,2],[5,0],[5,2]] and
-                type(board[4][1]) != Cannon and issubclass(type(board[4][1]), Piece)):
-            return True
-
-        # for moving diagonally in the blue palace
-        if (from_coordinates in [[3,7],[3,9],[5,7],[5,9]] and to_coordinates in [[3,7],[3,9],[5,7],[5,9]] and
-                type(board[4][8]) != Cannon and issubclass(type(board[4][8]), Piece)):
-            return True
-
-        return False
+        # make sure there is exactly one intervening piece that's not a cannon
+        screen = None
+        for square in between:
+            value = board[square]
+            if value == EMPTY:
+                continue
+            if screen is not None or value & PIECE_TYPE_MASK == CANNON:
+                return False
+            screen = value
+        return screen is not None
+
+    def generate_moves(self, board):
+        """
+        Walks each ray out from the Cannon to its first piece, the screen, which must not be a Cannon. Past the screen,
+        yields empty squares until the next piece, which is yielded too if it belongs to the other player and isn't a
+        Cannon (see Piece.generate_moves())
+        """
+
+        for ray in LINE_RAYS[self.get_square()]:
+            screen = None
+            for i, square in enumerate(ray):
+                if board[square] != EMPTY:
+                    screen = i
+                    break
+            if screen is None or board[ray[screen]] & PIECE_TYPE_MASK == CANNON:
+                continue
+            for square in ray[screen + 1:]:
+                value = board[square]
+                if value == EMPTY:
+                    yield [square // 10, square % 10]
+                    continue
+                if value & PIECE_TYPE_MASK != CANNON and not self.is_own_piece(value):
+                    yield [square // 10, square % 10]
+                break
 
 
 class Soldier(Piece):
@@ -835,53 +1453,28 @@ class Soldier(Piece):
 
         super().__init__(color, location)
         self._piece_type = 'So'
+        self._code = SOLDIER | self._color_bit
 
-    def validate_move(self, move_from, move_to, board):
+    def validate_squares(self, from_square, to_square, board):
         """
         Validates the proposed move for the piece. The Soldier can only move one space forward or to the side at a time.
-        However it can also move forward diagonally within a fortress.
-        :param move_from: starting location (ie. d1)
-        :param move_to: ending location (ie. d2)
-        :param board: not used for Soldier, but is necessary place holder as board needed in validate_move for other pieces
+        However it can also move forward diagonally within a fortress. Red soldiers move downward, blue soldiers upward.
+        :param from_square: starting square number (ie. 30 for d1)
+        :param to_square: ending square number (ie. 31 for d2)
+        :param board: not used for Soldier, but is necessary place holder as board needed in validate_squares for other
+        pieces
         :return: True if move is valid, False otherwise
         """
 
-        from_coordinates = JanggiGame.translate_to_grid(move_from)
-        to_coordinates = JanggiGame.translate_to_grid(move_to)
-        from_col = from_coordinates[0]
-        from_row = from_coordinates[1]
-        to_col = to_coordinates[0]
-        to_row = to_coordinates[1]
-
-        # for red soldiers (who can only move downward or to the side)
-        if self.get_color() == 'red':
-            # if destination within the board and the move is strictly one downward or to the side
-            if (to_col in range(9) and to_row in range(10) and
-                    ((abs(to_col - from_col) == 1 and to_row == from_row) or (to_col == from_col and to_row - from_row == 1))):
-                return True
-            # if moving diagonally within the blue palace
-            if from_coordinates in [[3,7],[5,7]] and to_coordinates == [4,8]:
-                return True
-            if from_coordinates == [4,8] and to_coordinates in [[3,9],[5,9]]:
-                return True
-
-            return False
-
-        # for blue soldiers (who can only move upward or to the side)
-        if self.get_color() == 'blue':
-            # if destination within the board and the move is strictly one upward or to the side
-            if (to_col in range(9) and to_row in range(10) and
-                    ((abs(to_col - from_col) == 1 and to_row == from_row) or (to_col == from_col and to_row - from_row == -1))):
-                return True
-            # if moving diagonally within the red palace
-            if from_coordinates in [[3, 2], [5, 2]] and to_coordinates == [4, 1]:
-                return True
-            if from_coordinates == [4, 1] and to_coordinates in [[3, 0], [5, 0]]:
-                return True
+        return self._validate_step(from_square, to_square)
 
-            return False
+    def generate_moves(self, board):
+        """
+        Yields one space forward or to either side, plus the forward palace diagonals in the other player's palace
+        (see Piece.generate_moves())
+        """
 
-        return False
+        return self._generate_steps(board)
 
 
 def main():
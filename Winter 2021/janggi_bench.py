@@ -0,0 +1,168 @@
+# Author: Zach Gee
+# Description: Benchmarks and regression checks for JanggiGame.py. perft counts every sequence of legal moves to a
+#               fixed depth from a set of test positions, checking the counts against known values and timing them.
+#               The checkmate benchmark times JanggiGame.checkmate on a corpus of positions in check.
+
+import argparse
+import json
+import random
+import re
+import time
+
+from JanggiGame import JanggiGame
+
+# test positions, as the moves played from the starting position (from the game in JanggiGame.main())
+POSITIONS = {
+    'start': '',
+    'middlegame': 'a7a6 h1g3 a10a7 b1d4 a7b7 c1a2 b7b3 h3b3 e7e6 i1h1 i7h7 a2b4 b10d7 b4a6 i10i9 a6b8 c10b8 b3b9 '
+                  'i9i6 a1b1',
+    'check': 'a7a6 h1g3 a10a7 b1d4 a7b7 c1a2 b7b3 h3b3 e7e6 i1h1 i7h7 a2b4 b10d7 b4a6 i10i9 a6b8 c10b8 b3b9 i9i6 '
+             'a1b1 b8c6 b1b8 h8h1 g3h1 e6d6 h1g3 d6d5 d4b1 i6e6 i4i5 c6d4 c4d4 d5d4 g4f4 d4e4 f4e4 e6e4 g3e4 h10i8 '
+             'e4f6 g7g6 b1d4 g6f6 d4f7 d7f4 f7c9',
+    'endgame': 'a7a6 h1g3 a10a7 b1d4 a7b7 c1a2 b7b3 h3b3 e7e6 i1h1 i7h7 a2b4 b10d7 b4a6 i10i9 a6b8 c10b8 b3b9 i9i6 '
+               'a1b1 b8c6 b1b8 h8h1 g3h1 e6d6 h1g3 d6d5 d4b1 i6e6 i4i5 c6d4 c4d4 d5d4 g4f4 d4e4 f4e4 e6e4 g3e4 '
+               'h10i8 e4f6 g7g6 b1d4 g6f6 d4f7 d7f4 f7c9 d10d9 a4a5 f6f5 g1e4 c7c6 b8i8 f5e5 e4g1 e5d5 i8i9 f10f9 '
+               'a5a6 d5d4 a6a7 d4d3 e2d3 e9e8 i9f9',
+}
+
+# perft counts of the test positions for depths 1, 2, 3, ...
+EXPECTED_PERFT = {
+    'start': [31, 961, 30506, 967906, 31800489],
+    'middlegame': [44, 2080, 88761, 3910177],
+    'check': [2, 88, 2138, 81466, 1933980],
+    'endgame': [18, 535, 8565, 264238, 4061710],
+}
+
+
+def split_moves(moves: str) -> []:
+    """
+    Returns the (move_from, move_to) pairs of a string of moves like 'a7a6 h1g3'
+    """
+    return [re.fullmatch(r'([a-i]\d+)([a-i]\d+)', move).groups() for move in moves.split()]
+
+
+def play(moves: str) -> JanggiGame:
+    """
+    Returns a new JanggiGame with the passed moves (a string like 'a7a6 h1g3') played from the starting position
+    """
+    game = JanggiGame()
+    for move_from, move_to in split_moves(moves):
+        if not game.make_move(move_from, move_to):
+            raise ValueError('illegal move ' + move_from + move_to)
+    return game
+
+
+def bench_perft(position: str, depth: int, divide=False) -> {}:
+    """
+    Runs perft(depth) on a test position and returns a record with the node count, the time taken, the nodes per
+    second and whether the count matches EXPECTED_PERFT (None if no count is known for that depth)
+    """
+    game = play(POSITIONS[position])
+    start = time.perf_counter()
+    nodes = game.perft(depth, divide)
+    seconds = time.perf_counter() - start
+    expected = EXPECTED_PERFT.get(position, [])
+    return {'position': position, 'depth': depth, 'nodes': nodes, 'seconds': round(seconds, 4),
+            'nodes_per_second': round(nodes / seconds) if seconds > 0 else None,
+            'ok': nodes == expected[depth - 1] if depth <= len(expected) else None}
+
+
+def check_positions(count: int, seed=0, max_moves=200) -> []:
+    """
+    Plays seeded games of random legal moves and returns the first count positions in which the player to move is in
+    check, as strings of the moves played to reach them
+    """
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        game = JanggiGame()
+        moves = []
+        for _ in range(max_moves):
+            legal_moves = game.legal_moves()
+            if not legal_moves:
+                break
+            move_from, move_to = rng.choice(legal_moves)
+            game.make_move(move_from, move_to)
+            moves.append(move_from + move_to)
+            # blue moves first, so red is to move after an odd number of moves
+            if game.is_in_check('red' if len(moves) % 2 else 'blue'):
+                positions.append(' '.join(moves))
+                if len(positions) == count:
+                    break
+    return positions
+
+
+def checkmate_by_trying_every_move(game: JanggiGame, general) -> bool:
+    """
+    The checkmate test before it was based on check evasion, for comparison: tries every possible move of every piece
+    of the General's player and asks is_a_player_in_check after each
+    """
+    color = general.get_color()
+    squares = game.get_squares()
+    for piece in game.get_active_pieces(color):
+        from_square = piece.get_square()
+        for to_col, to_row in piece.possible_moves(squares):
+            game.push_move(from_square, to_col * 10 + to_row)
+            escaped = game.is_a_player_in_check(color) != general
+            game.pop_move()
+            if escaped:
+                return False
+    return True
+
+
+def bench_checkmate(count: int, seed=0) -> {}:
+    """
+    Times JanggiGame.checkmate against checkmate_by_trying_every_move on count positions in check (see
+    check_positions), checking that both give the same answers, and returns a record with the totals and speedup
+    """
+    games = []
+    for moves in check_positions(count, seed):
+        game = play(moves)
+        games.append((game, game.get_general('red' if len(moves.split()) % 2 else 'blue')))
+
+    start = time.perf_counter()
+    results = [game.checkmate(general) for game, general in games]
+    seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    reference = [checkmate_by_trying_every_move(game, general) for game, general in games]
+    reference_seconds = time.perf_counter() - start
+    if results != reference:
+        raise SystemExit('checkmate differs from checkmate_by_trying_every_move')
+
+    return {'positions': count, 'checkmates': sum(results), 'seconds': round(seconds, 4),
+            'every_move_seconds': round(reference_seconds, 4), 'speedup': round(reference_seconds / seconds, 1)}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="perft regression and performance suite for JanggiGame")
+    parser.add_argument('--positions', nargs='+', choices=tuple(POSITIONS), default=list(POSITIONS))
+    parser.add_argument('--depth', type=int, default=3, help='deepest perft to run (the start position takes minutes '
+                                                             'at depth 5)')
+    parser.add_argument('--divide', action='store_true', help='print the count below each first move at --depth')
+    parser.add_argument('--check-positions', type=int, default=300,
+                        help='positions in check for the checkmate benchmark (0 to skip it)')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the random games the check positions come from')
+    parser.add_argument('--output', help='write the results to this JSON file')
+    arguments = parser.parse_args()
+
+    results = []
+    for position in arguments.positions:
+        for depth in range(1, arguments.depth + 1):
+            record = bench_perft(position, depth, arguments.divide and depth == arguments.depth)
+            results.append(record)
+            print(record)
+
+    checkmate_record = None
+    if arguments.check_positions > 0:
+        print("\nJanggiGame.checkmate() on positions in check")
+        print("-------------------------------------------")
+        checkmate_record = bench_checkmate(arguments.check_positions, arguments.seed)
+        print(checkmate_record)
+
+    if arguments.output is not None:
+        with open(arguments.output, 'w') as output_file:
+            json.dump({'results': results, 'checkmate': checkmate_record}, output_file, indent=2)
+
+    failed = [record for record in results if record['ok'] is False]
+    if failed:
+        raise SystemExit('perft counts differ from EXPECTED_PERFT: ' + str(failed))
@@ -0,0 +1,430 @@
+# Author: Zach Gee
+# Description: Alpha-beta search engine for JanggiGame. Searches the legal moves of a JanggiGame position with
+#               negamax alpha-beta and iterative deepening under a time budget, and plays the best move found through
+#               JanggiGame.make_move.
+
+import argparse
+import time
+
+from JanggiGame import (JanggiGame, TranspositionTable, EXACT, LOWER_BOUND, UPPER_BOUND, SQUARE_COUNT, SQUARE_NAMES,
+                        EMPTY, BLUE, PIECE_TYPE_MASK, GENERAL, GUARD, HORSE, ELEPHANT, CHARIOT, CANNON, SOLDIER)
+
+# material value of each piece type, in hundredths of a Soldier's usual value of 2 points
+PIECE_VALUES = {GENERAL: 0, GUARD: 300, HORSE: 500, ELEPHANT: 300, CHARIOT: 1300, CANNON: 700, SOLDIER: 200}
+MATE_SCORE = 100000
+# scores beyond this are mates, counted in moves from the root
+MATE_BOUND = MATE_SCORE - 1000
+MAX_PLY = 64
+# the search checks the clock every this many nodes (a power of two minus one, used as a mask)
+TIME_CHECK_MASK = 1023
+
+
+def positional_table(piece_type):
+    """
+    Returns the positional bonus of a red piece of the passed type on each square (blue's table is the mirror image):
+    Soldiers gain as they advance and near the center, Horses and Cannons like the center and dislike the edges,
+    Chariots like the open middle columns and the other player's side, and the General and Guards like the palace
+    center
+    """
+
+    table = []
+    for square in range(SQUARE_COUNT):
+        col, row = divmod(square, 10)
+        center = 4 - abs(col - 4)
+        if piece_type == SOLDIER:
+            bonus = 12 * max(row - 3, 0) + (4 * center if row >= 5 else 0) + (30 if square in (37, 48, 57) else 0)
+        elif piece_type == HORSE:
+            bonus = 8 * center + 6 * min(row, 9 - row, 3) - (15 if col in (0, 8) else 0)
+        elif piece_type == CANNON:
+            bonus = 5 * center + (10 if row in (1, 2) else 0)
+        elif piece_type == CHARIOT:
+            bonus = (10 if col in (3, 4, 5) else 0) + (15 if row >= 5 else 0)
+        elif piece_type == ELEPHANT:
+            bonus = 4 * center
+        else:
+            bonus = 10 if square == 41 else 0
+        table.append(bonus)
+    return table
+
+
+def piece_square_scores():
+    """
+    Returns, for each piece code, the score of that piece on each square from red's point of view: its material value
+    plus its positional bonus, negated for blue pieces. EMPTY scores 0 everywhere.
+    """
+
+    scores = [[0] * SQUARE_COUNT for code in range(16)]
+    for piece_type, value in PIECE_VALUES.items():
+        table = positional_table(piece_type)
+        for square in range(SQUARE_COUNT):
+            scores[piece_type][square] = value + table[square]
+            # blue's row r is red's row 9 - r
+            scores[piece_type | BLUE][square] = -(value + table[square - square % 10 + 9 - square % 10])
+    return scores
+
+
+PIECE_SQUARE_SCORES = piece_square_scores()
+
+
+def evaluate(game):
+    """
+    Returns the static evaluation of a JanggiGame position from red's point of view: the sum of PIECE_SQUARE_SCORES
+    over the pieces on the board
+    """
+
+    squares = game.get_squares()
+    return sum(PIECE_SQUARE_SCORES[code][square] for square, code in enumerate(squares) if code != EMPTY)
+
+
+class SearchTimeout(Exception):
+    """
+    Raised inside the search when the time budget runs out, unwinding it back to JanggiEngine.search
+    """
+
+    pass
+
+
+class JanggiEngine:
+    """
+    Negamax alpha-beta search of JanggiGame positions. Searches with iterative deepening until a depth or time budget
+    is reached, orders moves by transposition table move, MVV-LVA for captures (most valuable victim, least valuable
+    attacker), two killer moves per ply and the history heuristic for quiet moves, and finishes each line with a
+    quiescence search of captures. Moves are made with JanggiGame.push_move and undone with pop_move, so the game is
+    left as it was; play() makes the chosen move with make_move.
+    """
+
+    def __init__(self, table_size=1 << 18):
+        """
+        Creates an engine with an empty transposition table.
+        :param table_size: number of transposition table entries
+        """
+
+        self._table = TranspositionTable(table_size)
+        self._killers = [[None, None] for ply in range(MAX_PLY + 1)]
+        self._history = [0] * (SQUARE_COUNT * SQUARE_COUNT)
+        self._nodes = 0
+        self._deadline = None
+
+    def search(self, game, max_depth=MAX_PLY, time_limit=1.0, verbose=False):
+        """
+        Searches the position of game for the player whose turn it is, deepening one move at a time until max_depth
+        is done or time_limit runs out, and returns the result of the deepest completed search.
+        :param game: JanggiGame to search, left unchanged
+        :param max_depth: deepest search, in moves (plies)
+        :param time_limit: seconds to search for, or None for no limit
+        :param verbose: True to print a line for each completed depth
+        :return: dictionary with the best 'move' ((move_from, move_to) in algebraic notation, or None if the player has
+        no legal move), its 'score' (hundredths of a Soldier for the player to move), 'depth', 'pv' (the expected line
+        of play), 'nodes', 'seconds' and 'nodes_per_second'
+        """
+
+        start = time.perf_counter()
+        self._deadline = None if time_limit is None else start + time_limit
+        self._nodes = 0
+        self._table.new_search()
+        self._killers = [[None, None] for ply in range(MAX_PLY + 1)]
+        self._history = [value // 4 for value in self._history]
+        result = {'move': None, 'score': 0, 'depth': 0, 'pv': []}
+
+        moves = game.legal_move_squares() if game.get_game_state() == 'UNFINISHED' else []
+        if moves:
+            score = evaluate(game)
+            best_move = None
+            for depth in range(1, max_depth + 1):
+                try:
+                    value, best_move = self._search_root(game, moves, depth, score, best_move)
+                except SearchTimeout:
+                    break
+                pv = self.principal_variation(game, depth)
+                result.update({'move': (SQUARE_NAMES[best_move[0]], SQUARE_NAMES[best_move[1]]), 'score': value,
+                               'depth': depth, 'pv': pv})
+                if verbose:
+                    seconds = time.perf_counter() - start
+                    print('depth', depth, 'score', value, 'nodes', self._nodes,
+                          'nps', round(self._nodes / seconds) if seconds > 0 else 0, 'pv', ' '.join(pv))
+                # a forced mate found needs no deeper search
+                if abs(value) >= MATE_BOUND:
+                    break
+            if result['move'] is None:
+                # not even depth 1 finished in time, so take the first legal move
+                result['move'] = (SQUARE_NAMES[moves[0][0]], SQUARE_NAMES[moves[0][1]])
+
+        seconds = time.perf_counter() - start
+        result.update({'nodes': self._nodes, 'seconds': round(seconds, 4),
+                       'nodes_per_second': round(self._nodes / seconds) if seconds > 0 else 0})
+        return result
+
+    def play(self, game, max_depth=MAX_PLY, time_limit=1.0):
+        """
+        Searches the position of game (see search()) and makes the best move found with make_move, or passes if the
+        player has no legal move.
+        :return: the search result (see search())
+        """
+
+        result = self.search(game, max_depth, time_limit)
+        if result['move'] is not None:
+            if not game.make_move(*result['move']):
+                raise RuntimeError('make_move refused the move ' + ''.join(result['move']))
+        elif game.get_game_state() == 'UNFINISHED':
+            # with no legal move and not in check, the player passes
+            game.make_move('a1', 'a1')
+        return result
+
+    def search_move(self, game, move, depth, alpha=-MATE_SCORE - 1, time_limit=None):
+        """
+        Searches a single move of the player whose turn it is to depth, so that the moves of a position can be split
+        between engines searching in parallel. Raises SearchTimeout if time_limit runs out first.
+        :param game: JanggiGame to search, left unchanged
+        :param move: (from_square, to_square) pair
+        :param depth: depth to search to, counting the move itself
+        :param alpha: score the move has to beat; a score at or below it is only an upper bound
+        :param time_limit: seconds to search for, or None for no limit
+        :return: score of the move for the player making it
+        """
+
+        self._nodes = 0
+        self._deadline = None if time_limit is None else time.perf_counter() + time_limit
+        return -self._negamax(game, move, depth - 1, -MATE_SCORE - 1, -alpha, 1, evaluate(game))
+
+    def get_nodes(self):
+        """
+        Returns the number of positions visited by the last search
+        """
+
+        return self._nodes
+
+    def _search_root(self, game, moves, depth, score, best_move):
+        """
+        Searches each legal move of the root position to depth, the best move of the previous depth first, and returns
+        the best score and move
+        """
+
+        ordered = self._order_moves(game.get_squares(), moves, best_move, 0)
+        alpha = -MATE_SCORE - 1
+        beta = MATE_SCORE + 1
+        best = None
+        for move in ordered:
+            value = -self._negamax(game, move, depth - 1, -beta, -alpha, 1, score)
+            if best is None or value > alpha:
+                alpha = value
+                best = move
+        self._table.store(game.get_hash(), depth, alpha, EXACT, best)
+        return alpha, best
+
+    def _negamax(self, game, move, depth, alpha, beta, ply, score):
+        """
+        Makes move, searches the resulting position to depth (quiescence search below 0, unless in check), undoes the
+        move and returns the score of the resulting position for the player to move in it.
+        :param score: static evaluation before the move, from red's point of view (updated incrementally)
+        """
+
+        squares = game.get_squares()
+        from_square, to_square = move
+        moving = squares[from_square]
+        score += (PIECE_SQUARE_SCORES[moving][to_square] - PIECE_SQUARE_SCORES[moving][from_square] -
+                  PIECE_SQUARE_SCORES[squares[to_square]][to_square])
+        game.push_move(from_square, to_square)
+        try:
+            return self._search_position(game, depth, alpha, beta, ply, score)
+        finally:
+            game.pop_move()
+
+    def _search_position(self, game, depth, alpha, beta, ply, score):
+        """
+        Searches the current position to depth within the (alpha, beta) window and returns its score for the player to
+        move
+        """
+
+        self._nodes += 1
+        if self._nodes & TIME_CHECK_MASK == 0 and self._deadline is not None and time.perf_counter() > self._deadline:
+            raise SearchTimeout()
+
+        turn = game.get_turn()
+        if game.repetition_count() > 1:
+            return 0
+        if ply >= MAX_PLY:
+            return score if turn == 'red' else -score
+        in_check = game.is_in_check(turn)
+        if depth <= 0 and not in_check:
+            return self._quiescence(game, alpha, beta, ply, score)
+
+        key = game.get_hash()
+        entry = self._table.lookup(key)
+        table_move = None
+        if entry is not None:
+            table_move = entry[4]
+            if entry[1] >= depth:
+                value = self._from_table(entry[2], ply)
+                if (entry[3] == EXACT or (entry[3] == LOWER_BOUND and value >= beta) or
+                        (entry[3] == UPPER_BOUND and value <= alpha)):
+                    return value
+
+        moves = game.legal_move_squares()
+        if not moves:
+            if in_check:
+                return -MATE_SCORE + ply
+            # the player can still pass
+            game.push_move(0, 0)
+            try:
+                return -self._search_position(game, depth - 1, -beta, -alpha, ply + 1, score)
+            finally:
+                game.pop_move()
+
+        squares = game.get_squares()
+        original_alpha = alpha
+        best = None
+        best_move = None
+        for move in self._order_moves(squares, moves, table_move, ply):
+            value = -self._negamax(game, move, depth - 1, -beta, -alpha, ply + 1, score)
+            if best is None or value > best:
+                best = value
+                best_move = move
+            if value > alpha:
+                alpha = value
+            if alpha >= beta:
+                if squares[move[1]] == EMPTY:
+                    self._record_cutoff(move, depth, ply)
+                break
+
+        if best <= original_alpha:
+            flag = UPPER_BOUND
+        elif best >= beta:
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+        self._table.store(key, depth, self._to_table(best, ply), flag, best_move)
+        return best
+
+    def _quiescence(self, game, alpha, beta, ply, score):
+        """
+        Searches only the captures of the current position, with the static evaluation as the score for stopping
+        (stand pat), so that lines are not cut off in the middle of an exchange
+        """
+
+        self._nodes += 1
+        if self._nodes & TIME_CHECK_MASK == 0 and self._deadline is not None and time.perf_counter() > self._deadline:
+            raise SearchTimeout()
+
+        stand_pat = score if game.get_turn() == 'red' else -score
+        if stand_pat >= beta or ply >= MAX_PLY:
+            return stand_pat
+        if stand_pat > alpha:
+            alpha = stand_pat
+
+        squares = game.get_squares()
+        captures = [move for move in game.legal_move_squares() if squares[move[1]] != EMPTY]
+        for move in self._order_moves(squares, captures, None, ply):
+            capture_score = score
+            from_square, to_square = move
+            moving = squares[from_square]
+            capture_score += (PIECE_SQUARE_SCORES[moving][to_square] - PIECE_SQUARE_SCORES[moving][from_square] -
+                              PIECE_SQUARE_SCORES[squares[to_square]][to_square])
+            game.push_move(from_square, to_square)
+            try:
+                value = -self._quiescence(game, -beta, -alpha, ply + 1, capture_score)
+            finally:
+                game.pop_move()
+            if value >= beta:
+                return value
+            if value > alpha:
+                alpha = value
+        return alpha
+
+    def _order_moves(self, squares, moves, table_move, ply):
+        """
+        Returns moves sorted best first: the transposition table move, captures by MVV-LVA, the killer moves of ply,
+        then quiet moves by history score
+        """
+
+        killers = self._killers[ply]
+        history = self._history
+
+        def priority(move):
+            if move == table_move:
+                return 1 << 30
+            victim = squares[move[1]]
+            if victim != EMPTY:
+                return (1 << 24) + PIECE_VALUES[victim & PIECE_TYPE_MASK] * 16 - \
+                    PIECE_VALUES[squares[move[0]] & PIECE_TYPE_MASK] // 100
+            if move == killers[0]:
+                return (1 << 23) + 1
+            if move == killers[1]:
+                return 1 << 23
+            return history[move[0] * SQUARE_COUNT + move[1]]
+
+        return sorted(moves, key=priority, reverse=True)
+
+    def _record_cutoff(self, move, depth, ply):
+        """
+        Remembers a quiet move that caused a beta cutoff as a killer move of ply and raises its history score
+        """
+
+        killers = self._killers[ply]
+        if move != killers[0]:
+            killers[1] = killers[0]
+            killers[0] = move
+        index = move[0] * SQUARE_COUNT + move[1]
+        self._history[index] += depth * depth
+        if self._history[index] >= 1 << 22:
+            self._history = [value // 2 for value in self._history]
+
+    @staticmethod
+    def _to_table(value, ply):
+        """
+        Converts a mate score counted from the root to one counted from the current position, for storing
+        """
+
+        if value >= MATE_BOUND:
+            return value + ply
+        if value <= -MATE_BOUND:
+            return value - ply
+        return value
+
+    @staticmethod
+    def _from_table(value, ply):
+        """
+        Converts a stored mate score counted from its position back to one counted from the root
+        """
+
+        if value >= MATE_BOUND:
+            return value - ply
+        if value <= -MATE_BOUND:
+            return value + ply
+        return value
+
+    def principal_variation(self, game, depth):
+        """
+        Returns the expected line of play from the current position by following the transposition table moves, as
+        algebraic moves like 'a7a6'
+        """
+
+        pv = []
+        for ply in range(depth):
+            entry = self._table.lookup(game.get_hash())
+            if entry is None or entry[4] is None or entry[4] not in game.legal_move_squares():
+                break
+            game.push_move(*entry[4])
+            pv.append(SQUARE_NAMES[entry[4][0]] + SQUARE_NAMES[entry[4][1]])
+        for move in pv:
+            game.pop_move()
+        return pv
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Let the engine play a game of Janggi against itself")
+    parser.add_argument('--moves', type=int, default=10, help='moves to play')
+    parser.add_argument('--time', type=float, default=1.0, help='seconds of search per move')
+    parser.add_argument('--depth', type=int, default=MAX_PLY, help='deepest search per move')
+    arguments = parser.parse_args()
+
+    game = JanggiGame()
+    engine = JanggiEngine()
+    for move_number in range(arguments.moves):
+        if game.get_game_state() != 'UNFINISHED':
+            break
+        turn = game.get_turn()
+        result = engine.play(game, arguments.depth, arguments.time)
+        print(turn, result['move'], 'score', result['score'], 'depth', result['depth'], 'nodes', result['nodes'],
+              'nps', result['nodes_per_second'], 'pv', ' '.join(result['pv']))
+    game.display_board()
+    print(game.get_game_state())
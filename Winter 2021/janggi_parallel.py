@@ -0,0 +1,230 @@
+# Author: Zach Gee
+# Description: Parallel search for janggi_engine. Splits the moves of the position being searched (the root) between
+#               worker processes, each with its own JanggiEngine and transposition table, and measures the speedup
+#               over the single-process engine for different numbers of processes on a fixed set of test positions.
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+from JanggiGame import JanggiGame, SQUARE_NAMES, PIECE_TYPE_MASK
+from janggi_engine import JanggiEngine, SearchTimeout, MATE_SCORE, MATE_BOUND, MAX_PLY, PIECE_VALUES
+from janggi_bench import POSITIONS, play
+
+# the engine of each worker process, kept between searches so its transposition table stays warm
+_worker_engine = None
+
+
+def start_worker(table_size):
+    """
+    Sets up the engine of a worker process
+    """
+
+    global _worker_engine
+    _worker_engine = JanggiEngine(table_size)
+
+
+def search_move_in_worker(history, move, depth, alpha, deadline):
+    """
+    Searches one root move in a worker process. The position is sent as its move history (see
+    JanggiGame.get_move_history), 2 bytes a move, and rebuilt here with push_move. deadline is a time.time() value, or
+    None for no time limit, so that a search that waited for a free worker does not get the whole time budget.
+    :return: (score of the move or None if time ran out, expected line of play after it, nodes searched)
+    """
+
+    game = JanggiGame()
+    for index in range(0, len(history), 2):
+        game.push_move(history[index], history[index + 1])
+    time_limit = None if deadline is None else max(deadline - time.time(), 0)
+    try:
+        value = _worker_engine.search_move(game, move, depth, alpha, time_limit)
+    except SearchTimeout:
+        return None, [], _worker_engine.get_nodes()
+    game.push_move(*move)
+    pv = _worker_engine.principal_variation(game, depth - 1)
+    return value, pv, _worker_engine.get_nodes()
+
+
+class ParallelJanggiEngine:
+    """
+    Root-splitting parallel search. Each iteration of iterative deepening searches the best move of the previous
+    iteration first, then searches the other root moves at the same time in the worker processes against its score,
+    so that they only have to prove they are no better (as the sequential alpha-beta search would). The result is the
+    same kind of dictionary JanggiEngine.search returns.
+    """
+
+    def __init__(self, processes=None, table_size=1 << 18):
+        """
+        Starts the worker processes.
+        :param processes: number of worker processes (the number of CPUs if None)
+        :param table_size: number of transposition table entries of each worker
+        """
+
+        self._processes = processes or os.cpu_count() or 1
+        self._pool = ProcessPoolExecutor(self._processes, initializer=start_worker, initargs=(table_size,))
+
+    def __enter__(self):
+        """
+        Returns the engine, for use in a with statement that stops the worker processes at its end
+        """
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+        Stops the worker processes at the end of a with statement
+        """
+
+        self.close()
+
+    def close(self):
+        """
+        Stops the worker processes
+        """
+
+        self._pool.shutdown(cancel_futures=True)
+
+    def get_processes(self):
+        """
+        Returns the number of worker processes
+        """
+
+        return self._processes
+
+    def search(self, game, max_depth=MAX_PLY, time_limit=1.0, verbose=False):
+        """
+        Searches the position of game for the player whose turn it is, deepening one move at a time until max_depth
+        is done or time_limit runs out (see JanggiEngine.search).
+        :return: dictionary with the best 'move', its 'score', 'depth', 'pv', 'nodes', 'seconds' and 'nodes_per_second'
+        """
+
+        start = time.perf_counter()
+        deadline = None if time_limit is None else time.time() + time_limit
+        history = game.get_move_history()
+        result = {'move': None, 'score': 0, 'depth': 0, 'pv': []}
+        nodes = 0
+
+        moves = game.legal_move_squares() if game.get_game_state() == 'UNFINISHED' else []
+        # captures of the most valuable pieces first until there are scores to order by
+        squares = game.get_squares()
+        moves.sort(key=lambda move: PIECE_VALUES.get(squares[move[1]] & PIECE_TYPE_MASK, 0), reverse=True)
+        depth = 1
+        while moves and depth <= max_depth:
+            scores, depth_nodes = self._search_depth(history, moves, depth, deadline)
+            nodes += depth_nodes
+            if scores is None:
+                break
+            # the best move first at the next depth; the other scores are upper bounds, but still order the moves
+            moves.sort(key=lambda move: scores[move][0], reverse=True)
+            best = moves[0]
+            value, pv = scores[best]
+            result.update({'move': (SQUARE_NAMES[best[0]], SQUARE_NAMES[best[1]]), 'score': value, 'depth': depth,
+                           'pv': [SQUARE_NAMES[best[0]] + SQUARE_NAMES[best[1]]] + pv})
+            if verbose:
+                seconds = time.perf_counter() - start
+                print('depth', depth, 'score', value, 'nodes', nodes,
+                      'nps', round(nodes / seconds) if seconds > 0 else 0, 'pv', ' '.join(result['pv']))
+            if abs(value) >= MATE_BOUND:
+                break
+            depth += 1
+        if result['move'] is None and moves:
+            result['move'] = (SQUARE_NAMES[moves[0][0]], SQUARE_NAMES[moves[0][1]])
+
+        seconds = time.perf_counter() - start
+        result.update({'nodes': nodes, 'seconds': round(seconds, 4),
+                       'nodes_per_second': round(nodes / seconds) if seconds > 0 else 0})
+        return result
+
+    def play(self, game, max_depth=MAX_PLY, time_limit=1.0):
+        """
+        Searches the position of game (see search()) and makes the best move found with make_move, or passes if the
+        player has no legal move.
+        :return: the search result (see search())
+        """
+
+        result = self.search(game, max_depth, time_limit)
+        if result['move'] is not None:
+            if not game.make_move(*result['move']):
+                raise RuntimeError('make_move refused the move ' + ''.join(result['move']))
+        elif game.get_game_state() == 'UNFINISHED':
+            game.make_move('a1', 'a1')
+        return result
+
+    def _search_depth(self, history, moves, depth, deadline):
+        """
+        Searches every root move to depth, moves[0] first and the rest in parallel against its score.
+        :param deadline: time.time() at which to stop, or None for no time limit
+        :return: ({move: (score, pv)}, nodes searched), with None instead of the scores if time ran out
+        """
+
+        def submit(move, alpha):
+            return self._pool.submit(search_move_in_worker, history, move, depth, alpha, deadline)
+
+        first_value, first_pv, nodes = submit(moves[0], -MATE_SCORE - 1).result()
+        if first_value is None:
+            return None, nodes
+        scores = {moves[0]: (first_value, first_pv)}
+
+        futures = {submit(move, first_value): move for move in moves[1:]}
+        pending = set(futures)
+        timed_out = False
+        while pending and not timed_out:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                value, pv, move_nodes = future.result()
+                nodes += move_nodes
+                if value is None:
+                    timed_out = True
+                else:
+                    scores[futures[future]] = (value, pv)
+        for future in pending:
+            future.cancel()
+        for future in pending:
+            if not future.cancelled():
+                nodes += future.result()[2]
+        return (None if timed_out else scores), nodes
+
+
+def bench_speedup(processes_list: [], depth: int, positions: []) -> []:
+    """
+    Searches each test position to depth with the single-process JanggiEngine and with ParallelJanggiEngine for each
+    number of processes, and returns a record per engine with the total time, nodes and speedup over JanggiEngine.
+    Each engine starts with empty transposition tables, and no time limit is set, so all search the same depth.
+    """
+
+    records = []
+    engine = JanggiEngine()
+    start = time.perf_counter()
+    nodes = sum(engine.search(play(POSITIONS[position]), depth, None)['nodes'] for position in positions)
+    serial_seconds = time.perf_counter() - start
+    records.append({'engine': 'JanggiEngine', 'processes': 1, 'depth': depth, 'nodes': nodes,
+                    'seconds': round(serial_seconds, 3), 'speedup': 1.0})
+
+    for processes in processes_list:
+        with ParallelJanggiEngine(processes) as parallel_engine:
+            start = time.perf_counter()
+            nodes = sum(parallel_engine.search(play(POSITIONS[position]), depth, None)['nodes']
+                        for position in positions)
+            seconds = time.perf_counter() - start
+        records.append({'engine': 'ParallelJanggiEngine', 'processes': processes, 'depth': depth, 'nodes': nodes,
+                        'seconds': round(seconds, 3), 'speedup': round(serial_seconds / seconds, 2)})
+    return records
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Speedup of the parallel Janggi search over the single-process engine")
+    parser.add_argument('--processes', type=int, nargs='+', default=[1, 2, 4], help='numbers of worker processes')
+    parser.add_argument('--depth', type=int, default=4, help='depth to search each test position to')
+    parser.add_argument('--positions', nargs='+', choices=tuple(POSITIONS), default=list(POSITIONS))
+    parser.add_argument('--output', help='write the results to this JSON file')
+    arguments = parser.parse_args()
+
+    print('CPUs:', os.cpu_count())
+    results = bench_speedup(arguments.processes, arguments.depth, arguments.positions)
+    for record in results:
+        print(record)
+    if arguments.output is not None:
+        with open(arguments.output, 'w') as output_file:
+            json.dump({'cpus': os.cpu_count(), 'results': results}, output_file, indent=2)